@@ -4,15 +4,34 @@ Serves strategy data from InfluxDB as a clean JSON API
 """
 
 import os
-from fastapi import FastAPI
+import json
+import time
+import hashlib
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+import numpy as np
 import pandas as pd
-from influxdb_client import InfluxDBClient
+from influx_client import get_query_api
+from gist_cache import GistCache, GistPrefetcher, DEFAULT_CACHE_DIR, valid_gist_id
+from strategy_records import miner_records, benchmark_records
+from block_index import BlockIndex, BenchmarkIndex, IncrementalFrame, CONFIG_FIELDS
 from dotenv import load_dotenv
-import requests
 from typing import Optional
+from datetime import datetime, timedelta, timezone
 import uvicorn
 
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional: gzip only
+    BrotliMiddleware = None
+
 # ------------------------------
 # Load ENV Variables
 # ------------------------------
@@ -26,14 +45,26 @@ if os.path.exists(ENV_PATH):
 # InfluxDB Config
 # ------------------------------
 INFLUXDB_URL = os.getenv("INFLUXDB_URL")
-INFLUXDB_ORG = os.getenv("INFLUXDB_ORG")
-INFLUXDB_TOKEN = os.getenv("INFLUXDB_TOKEN_MECHANISM_1")
 INFLUXDB_BUCKET = os.getenv("INFLUXDB_BUCKET_MECHANISM_1")
 INFLUXDB_MEASUREMENT = "hotkey_scores"
 INFLUXDB_BENCHMARK_MEASUREMENT = "benchmark_scores"
 
-client = InfluxDBClient(url=INFLUXDB_URL, token=INFLUXDB_TOKEN, org=INFLUXDB_ORG)
-query_api = client.query_api()
+query_api = get_query_api(1, url=INFLUXDB_URL)
+
+# ------------------------------
+# Blocking I/O
+# ------------------------------
+# Influx queries and GitHub calls are blocking; they run on this bounded pool
+# so the event loop keeps serving other requests meanwhile
+_io_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("MECH1_IO_WORKERS", "16")),
+    thread_name_prefix="mech1-io",
+)
+
+
+async def run_blocking(fn, *args):
+    """Run a blocking call on the I/O pool and await its result"""
+    return await asyncio.get_running_loop().run_in_executor(_io_executor, fn, *args)
 
 # ------------------------------
 # FastAPI App
@@ -47,27 +78,136 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified"],
 )
 
+class CompressionExcept:
+    """
+    Compresses large bodies (brotli when installed, it falls back to gzip
+    itself), except for `exclude_paths`: streams such as SSE would otherwise sit
+    in the compressor's buffer instead of reaching the client.
+    """
+
+    def __init__(self, app, exclude_paths=(), minimum_size=1000):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+        middleware = BrotliMiddleware if BrotliMiddleware is not None else GZipMiddleware
+        self.compressed = middleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+        else:
+            await self.compressed(scope, receive, send)
 
-def shorten_hotkey(value, prefix=8, suffix=4):
-    """Shorten hotkey for display"""
-    if value is None:
-        return ""
-    s = str(value)
-    if len(s) <= prefix + suffix + 3:
-        return s
-    return f"{s[:prefix]}...{s[-suffix:]}"
 
+app.add_middleware(CompressionExcept, exclude_paths=("/api/mech1/stream",), minimum_size=1000)
+
+
+# ------------------------------
+# Conditional responses
+# ------------------------------
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dumps(payload):
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+class ResponseVersions:
+    """
+    Rendered JSON bodies with a strong ETag of "<block>-<content hash>" per
+    endpoint key, and the time each ETag was first served as Last-Modified, so
+    pollers revalidating with If-None-Match / If-Modified-Since get a 304 until
+    the data actually changes. Keys in `volatile` (countdowns recomputed on every
+    request) are left out of the hash. Only the max_entries most recently
+    rendered keys are kept (one per requested block).
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (etag, last_modified), least recently used first
+        self._lock = threading.Lock()
+
+    def render(self, key, payload, block=None, volatile=()):
+        body = _dumps(payload)
+        stable = _dumps({k: v for k, v in payload.items() if k not in volatile}) if volatile else body
+        etag = f'"{block}-{hashlib.blake2b(stable, digest_size=12).hexdigest()}"'
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                entry = (etag, time.time())
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body, etag, entry[1]
+
+
+response_versions = ResponseVersions(max_entries=int(os.getenv("MECH1_VERSIONED_RESPONSES", "64")))
+
+
+def not_modified(request, etag, last_modified):
+    """True if the request's validators still match (If-None-Match wins over If-Modified-Since)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        # Proxies that recompress may have weakened the tag
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def conditional_json(request, rendered):
+    """200 with the rendered body, or an empty 304 if the client already has it"""
+    body, etag, last_modified = rendered
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        # Cache but always revalidate, so browsers send If-None-Match on the next poll
+        "Cache-Control": "no-cache",
+    }
+    if not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
-# Simple cache for gist filenames to avoid repeated API calls
-_gist_filename_cache = {}
 
 # GitHub token for higher rate limits (optional)
 GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN', '')
 
+# Gist filenames and code, kept in memory and on disk across restarts
+gist_cache = GistCache(
+    cache_dir=os.getenv("GIST_CACHE_DIR", DEFAULT_CACHE_DIR),
+    max_entries=int(os.getenv("GIST_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("GIST_CACHE_TTL", "600")),
+    token=GITHUB_TOKEN,
+    pool_size=int(os.getenv("MECH1_IO_WORKERS", "16")),
+)
+gist_prefetcher = GistPrefetcher(gist_cache, workers=int(os.getenv("GIST_PREFETCH_WORKERS", "4")))
+
+
+def gist_id_from_url(gist_url):
+    """Gist id from a gist URL, or None if it doesn't look like one"""
+    if not gist_url or not isinstance(gist_url, str):
+        return None
+    gist_id = gist_url.rstrip('/').split('/')[-1]
+    # Skip if gist_id looks invalid
+    if not valid_gist_id(gist_id):
+        return None
+    return gist_id
+
+
 def extract_gist_filename(gist_url):
-    """Extract a readable filename from gist URL by fetching from GitHub API"""
+    """Filename of a gist as far as it is already resolved (never calls GitHub;
+    missing or stale gists are left to the prefetcher)"""
     if not gist_url or not isinstance(gist_url, str):
         return None
     
@@ -75,43 +215,14 @@ def extract_gist_filename(gist_url):
     if gist_url.startswith('benchmark_'):
         return gist_url.replace('_', ' ').title()
     
-    # Check cache first
-    if gist_url in _gist_filename_cache:
-        return _gist_filename_cache[gist_url]
-    
-    try:
-        parts = gist_url.rstrip('/').split('/')
-        if len(parts) >= 1:
-            gist_id = parts[-1]
-            # Skip if gist_id looks invalid
-            if not gist_id or len(gist_id) < 10:
-                return None
-            
-            # Try to fetch the actual filename from GitHub
-            try:
-                api_url = f"https://api.github.com/gists/{gist_id}"
-                headers = {}
-                if GITHUB_TOKEN:
-                    headers['Authorization'] = f'token {GITHUB_TOKEN}'
-                response = requests.get(api_url, headers=headers, timeout=5)
-                if response.status_code == 200:
-                    gist_data = response.json()
-                    files = gist_data.get('files', {})
-                    if files:
-                        # Return the first file's name
-                        filename = list(files.keys())[0]
-                        _gist_filename_cache[gist_url] = filename
-                        return filename
-                elif response.status_code == 403:
-                    print(f"GitHub API rate limited. Consider setting GITHUB_TOKEN env var.")
-            except Exception as e:
-                print(f"GitHub API error for {gist_id}: {e}")
-            
-            # Fallback: return None to let frontend use hotkey
-            return None
-    except:
-        pass
-    return None
+    gist_id = gist_id_from_url(gist_url)
+    if gist_id is None:
+        return None
+    # No-op unless the gist is unresolved or stale
+    gist_prefetcher.submit([gist_id])
+    # Fallback: None lets the frontend use the hotkey
+    entry = gist_cache.lookup(gist_id)
+    return entry.get("filename") if entry else None
 
 
 def fetch_gist_code(gist_url, max_lines=100):
@@ -119,61 +230,161 @@ def fetch_gist_code(gist_url, max_lines=100):
     if not gist_url or not isinstance(gist_url, str):
         return "# No code available"
     
+    gist_id = gist_id_from_url(gist_url)
+    if gist_id is None:
+        return {"content": "# Invalid gist id", "filename": "unknown.py", "truncated": False, "total_lines": 0}
+
     try:
-        parts = gist_url.rstrip('/').split('/')
-        gist_id = parts[-1]
-        api_url = f"https://api.github.com/gists/{gist_id}"
-        
-        response = requests.get(api_url, timeout=5)
-        if response.status_code == 200:
-            gist_data = response.json()
-            files = gist_data.get('files', {})
-            if files:
-                first_file = list(files.values())[0]
-                content = first_file.get('content', '# No content')
-                filename = first_file.get('filename', 'strategy.py')
-                lines = content.split('\n')
-                truncated = len(lines) > max_lines
-                if truncated:
-                    content = '\n'.join(lines[:max_lines]) + f"\n\n# ... ({len(lines) - max_lines} more lines)"
-                return {"content": content, "filename": filename, "truncated": truncated, "total_lines": len(lines)}
+        entry = gist_cache.get(gist_id)
+        if entry.get("content") is not None:
+            content = entry["content"]
+            filename = entry.get("filename") or 'strategy.py'
+            lines = content.split('\n')
+            truncated = len(lines) > max_lines
+            if truncated:
+                content = '\n'.join(lines[:max_lines]) + f"\n\n# ... ({len(lines) - max_lines} more lines)"
+            return {"content": content, "filename": filename, "truncated": truncated, "total_lines": len(lines)}
     except Exception as e:
         return {"content": f"# Error fetching code: {str(e)}", "filename": "error.py", "truncated": False, "total_lines": 0}
     
     return {"content": "# Unable to fetch code", "filename": "unknown.py", "truncated": False, "total_lines": 0}
 
 
+def query_measurement(measurement, start="-30d", stop="now()"):
+    """Query a measurement over [start, stop) (the last 30 days by default), pivoted to one row per _time"""
+    query = f"""
+    from(bucket: "{INFLUXDB_BUCKET}")
+      |> range(start: {start}, stop: {stop})
+      |> filter(fn: (r) => r._measurement == "{measurement}")
+      |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+    """
+    df = query_api.query_data_frame(query)
+
+    if isinstance(df, list):
+        df = pd.concat(df) if df else pd.DataFrame()
+    return df.drop(
+        columns=[c for c in df.columns if c in ["result", "table", "_start", "_stop", "_measurement"]],
+        errors="ignore"
+    )
+
+
+class MeasurementCache:
+    """
+    In-process TTL cache of the pivoted dataframe per measurement, optionally
+    turned into an index by prepare[measurement] once per refresh. A
+    measurement in `loaders` is refreshed by calling loaders[measurement]()
+    instead (e.g. an IncrementalFrame that only queries new rows).
+
+    Refreshes are single-flight: when an entry expires, one caller re-runs the
+    query while concurrent callers for the same measurement wait for its result,
+    so Influx sees one query per TTL regardless of how many viewers poll. If a
+    refresh fails, the previous frame (or, without one, the error) is served to
+    every caller for retry_after seconds before the query is tried again.
+    Cached values are shared: callers must not modify them in place.
+    """
+
+    def __init__(self, ttl, prepare=None, loaders=None, retry_after=5.0):
+        self.ttl = ttl
+        self.prepare = prepare or {}
+        self.loaders = loaders or {}
+        self.retry_after = retry_after
+        self._entries = {}  # measurement -> (fetched_at, df)
+        self._failures = {}  # measurement -> (failed_at, exception), while there is no entry
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock(self, measurement):
+        with self._locks_lock:
+            return self._locks.setdefault(measurement, threading.Lock())
+
+    def _fresh(self, measurement):
+        entry = self._entries.get(measurement)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def get(self, measurement):
+        df = self._fresh(measurement)
+        if df is not None:
+            return df
+        with self._lock(measurement):
+            # Whoever held the lock may have refreshed it already
+            df = self._fresh(measurement)
+            if df is not None:
+                return df
+            failure = self._failures.get(measurement)
+            if failure is not None and time.monotonic() - failure[0] < self.retry_after:
+                raise failure[1]
+            try:
+                load = self.loaders.get(measurement)
+                if load is not None:
+                    df = load()
+                else:
+                    df = query_measurement(measurement)
+                    prepare = self.prepare.get(measurement)
+                    if prepare is not None:
+                        df = prepare(df)
+            except Exception as e:
+                if measurement not in self._entries:
+                    self._failures[measurement] = (time.monotonic(), e)
+                    raise
+                print(f"Error refreshing {measurement}, serving cached data for {self.retry_after}s: {e}")
+                # Back-date the old entry so it stays fresh for retry_after more seconds
+                df = self._entries[measurement][1]
+                self._entries[measurement] = (time.monotonic() - self.ttl + self.retry_after, df)
+                return df
+            self._entries[measurement] = (time.monotonic(), df)
+            self._failures.pop(measurement, None)
+            return df
+
+
+# benchmark_scores is extended with new rows (fully reloaded now and then); the index is rebuilt when the 30-day window changed
+benchmark_frame = IncrementalFrame(
+    lambda start, stop: query_measurement(INFLUXDB_BENCHMARK_MEASUREMENT, start, stop), BenchmarkIndex
+)
+
+frame_cache = MeasurementCache(
+    ttl=float(os.getenv("MECH1_CACHE_TTL", "15")),
+    retry_after=float(os.getenv("MECH1_RETRY_AFTER", "5")),
+    prepare={INFLUXDB_MEASUREMENT: BlockIndex},
+    loaders={INFLUXDB_BENCHMARK_MEASUREMENT: benchmark_frame.refresh},
+)
+
+
+def watch_gist_urls():
+    """Queue every gist_url seen in hotkey_scores for prefetching, once per cache refresh"""
+    interval = float(os.getenv("GIST_PREFETCH_SECONDS", str(frame_cache.ttl)))
+    seen_index = None
+    while True:
+        try:
+            index = frame_cache.get(INFLUXDB_MEASUREMENT)
+            if index is not seen_index and "gist_url" in index.df.columns:
+                gist_ids = (gist_id_from_url(u) for u in index.df["gist_url"].dropna().unique())
+                gist_prefetcher.submit([g for g in gist_ids if g])
+            seen_index = index
+        except Exception as e:
+            print(f"Error watching gist urls: {e}")
+        time.sleep(interval)
+
+
 def load_mechanism1_metrics(current_block=None):
     """Query InfluxDB for mechanism 1 metrics"""
     try:
-        query = f"""
-        from(bucket: "{INFLUXDB_BUCKET}")
-          |> range(start: -30d)
-          |> filter(fn: (r) => r._measurement == "{INFLUXDB_MEASUREMENT}")
-          |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-        """
-        df = query_api.query_data_frame(query)
-
-        if isinstance(df, list):
-            df = pd.concat(df)
-        if df.empty:
+        index = frame_cache.get(INFLUXDB_MEASUREMENT)
+        if index.empty:
             return pd.DataFrame(), pd.DataFrame(), {}, None, []
     except Exception as e:
         print(f"Error querying InfluxDB: {e}")
         return pd.DataFrame(), pd.DataFrame(), {}, None, []
 
-    df["current_block"] = df["current_block"].fillna(0).astype(int)
-    all_blocks = sorted(df["current_block"].unique(), reverse=True)
-    latest_current_block = df["current_block"].max()
+    df = index.df
+    all_blocks = index.descending_blocks()
+    latest_current_block = index.latest
     
     if current_block is None:
         current_block = latest_current_block
 
-    filtered_df = df[df["current_block"] == current_block].copy()
-    filtered_df = filtered_df.drop(
-        columns=[c for c in filtered_df.columns if c in ["result", "table", "_start", "_stop", "_measurement"]], 
-        errors="ignore"
-    )
+    filtered_df = index.rows(current_block).copy()
 
     if filtered_df.empty:
         return df, pd.DataFrame(), {}, current_block, all_blocks
@@ -213,105 +424,8 @@ def load_benchmark_entries(metadata, selected_block=None):
     Returns benchmarks from the most recent block <= selected_block.
     If no benchmarks match the exact metadata, fall back to the latest available benchmarks."""
     try:
-        query = f"""
-        from(bucket: "{INFLUXDB_BUCKET}")
-          |> range(start: -30d)
-          |> filter(fn: (r) => r._measurement == "{INFLUXDB_BENCHMARK_MEASUREMENT}")
-          |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-        """
-        df = query_api.query_data_frame(query)
-
-        if isinstance(df, list):
-            df = pd.concat(df)
-        if df.empty:
-            return []
-
-        df = df.drop(
-            columns=[c for c in df.columns if c in ["result", "table", "_start", "_stop", "_measurement"]], 
-            errors="ignore"
-        )
-
-        # Convert current_block to numeric for comparison
-        if "current_block" in df.columns:
-            df["current_block"] = pd.to_numeric(df["current_block"], errors="coerce")
-
-        # Try to filter by exact metadata match
-        filtered_df = df.copy()
-        for field in ["dataset", "max_steps", "model_size", "number_of_nodes"]:
-            if field in filtered_df.columns and metadata.get(field):
-                filtered_df = filtered_df[filtered_df[field].astype(str) == str(metadata[field])]
-
-        # If no exact match, fall back to all available benchmarks
-        if filtered_df.empty:
-            print(f"No benchmarks match metadata {metadata}, using all available benchmarks")
-            filtered_df = df.copy()
-
-        # Filter by block: get benchmarks from the most recent block <= selected_block
-        if selected_block is not None and "current_block" in filtered_df.columns:
-            # Get benchmarks from blocks <= selected_block
-            filtered_df = filtered_df[filtered_df["current_block"] <= selected_block]
-            
-            if not filtered_df.empty:
-                # Find the most recent block that has benchmark data
-                most_recent_block = filtered_df["current_block"].max()
-                filtered_df = filtered_df[filtered_df["current_block"] == most_recent_block]
-                print(f"Using benchmarks from block {most_recent_block} for selected block {selected_block}")
-        
-        # If still empty after block filtering, use the earliest available benchmarks
-        if filtered_df.empty and not df.empty:
-            print(f"No benchmarks found for blocks <= {selected_block}, using earliest available")
-            if "current_block" in df.columns:
-                earliest_block = df["current_block"].min()
-                filtered_df = df[df["current_block"] == earliest_block]
-            else:
-                filtered_df = df.copy()
-
-        # Deduplicate by hotkey (keep first occurrence after sorting by time)
-        if "_time" in filtered_df.columns:
-            filtered_df["_time"] = pd.to_datetime(filtered_df["_time"])
-            filtered_df = filtered_df.sort_values("_time", ascending=False)
-        filtered_df = filtered_df.drop_duplicates(subset=["hotkey"], keep="first")
-
-        benchmarks = []
-        for _, row in filtered_df.iterrows():
-            gist_url = safe_str(row.get('gist_url', ''))
-            hotkey = safe_str(row.get('hotkey', ''))
-            
-            # Create a readable name from the benchmark hotkey
-            if hotkey.startswith('benchmark_'):
-                name = hotkey.replace('benchmark_', '').replace('_', ' ').title()
-            else:
-                name = gist_url if gist_url.startswith('benchmark_') else 'Benchmark'
-            
-            # Format last_update nicely
-            last_update_raw = safe_str(row.get('last_update', ''))
-            try:
-                if last_update_raw:
-                    # Parse ISO format and convert to nice format
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(last_update_raw.replace('Z', '+00:00'))
-                    last_update_formatted = dt.strftime('%Y-%m-%d %H:%M')
-                else:
-                    last_update_formatted = ''
-            except:
-                last_update_formatted = last_update_raw[:16] if len(last_update_raw) > 16 else last_update_raw
-            
-            benchmarks.append({
-                "uid": None,
-                "hotkey": hotkey,
-                "hotkey_short": name,
-                "score": safe_float(row.get('score', 0)) or 0.0,
-                "loss": safe_float(row.get('loss')),
-                "communication": safe_int(row.get('communication')),
-                "throughput": safe_int(row.get('throughput')),
-                "gist_url": gist_url,
-                "filename": name,
-                "last_update": last_update_formatted,
-                "time": "",
-                "is_benchmark": True
-            })
-
-        return benchmarks
+        index = frame_cache.get(INFLUXDB_BENCHMARK_MEASUREMENT)
+        return benchmark_records(index.as_of(metadata, selected_block))
     except Exception as e:
         print(f"Error loading benchmark entries: {e}")
         return []
@@ -326,46 +440,15 @@ def safe_int(val):
     except (TypeError, ValueError):
         return None
 
-def safe_float(val):
-    """Convert numpy float to Python float safely"""
-    if val is None or (hasattr(pd, 'isna') and pd.isna(val)):
-        return None
-    try:
-        return float(val)
-    except (TypeError, ValueError):
-        return None
-
-def safe_str(val):
-    """Convert value to string safely"""
-    if val is None or (hasattr(pd, 'isna') and pd.isna(val)):
-        return ''
-    return str(val)
-
 
-@app.get("/api/mech1/strategies")
-async def get_strategies(block: Optional[int] = None):
-    """Get all strategies for a given block (or latest if not specified)"""
+def build_strategies(block: Optional[int] = None):
+    """Strategies payload for a given block (blocking: queries Influx)"""
     _, filtered_df, metadata, current_block, all_blocks = load_mechanism1_metrics(block)
     
     # Load miner strategies
     miner_strategies = []
     if not filtered_df.empty:
-        for _, row in filtered_df.iterrows():
-            gist_url = safe_str(row.get('gist_url', ''))
-            miner_strategies.append({
-                "uid": safe_int(row.get('uid')),
-                "hotkey": safe_str(row.get('hotkey', '')),
-                "hotkey_short": shorten_hotkey(safe_str(row.get('hotkey', ''))),
-                "score": safe_float(row.get('score', 0)) or 0.0,
-                "loss": safe_float(row.get('loss')),
-                "communication": safe_int(row.get('communication')),
-                "throughput": safe_int(row.get('throughput')),
-                "gist_url": gist_url,
-                "filename": extract_gist_filename(gist_url),
-                "last_update": safe_str(row.get('last_update', '')),
-                "time": safe_str(row.get('_time', '')),
-                "is_benchmark": False
-            })
+        miner_strategies = miner_records(filtered_df, extract_gist_filename)
     
     # Load benchmark strategies for the selected block
     benchmark_strategies = load_benchmark_entries(metadata, selected_block=current_block)
@@ -389,178 +472,306 @@ async def get_strategies(block: Optional[int] = None):
     }
 
 
+class BlockWatcher:
+    """
+    The one loop that watches the cached hotkey_scores / benchmark_scores frames
+    for a new latest current_block; SSE clients await its state instead of each
+    polling the API, so N viewers cost one watch.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        # Version 0 means nothing was watched yet; the first successful watch is version 1
+        self.state = {"version": 0, "current_block": None, "benchmark_block": None}
+        self._changed = asyncio.Event()  # set and replaced on every new state
+
+    @staticmethod
+    def latest_block(measurement):
+        """Latest current_block of a cached measurement (blocking)"""
+        return frame_cache.get(measurement).latest
+
+    async def run(self):
+        fields = {"current_block": INFLUXDB_MEASUREMENT, "benchmark_block": INFLUXDB_BENCHMARK_MEASUREMENT}
+        while True:
+            # Each measurement is watched on its own, so a failing one keeps its
+            # last block instead of suppressing the other's events
+            blocks, watched = {}, False
+            for field, measurement in fields.items():
+                try:
+                    blocks[field] = await run_blocking(self.latest_block, measurement)
+                    watched = True
+                except Exception as e:
+                    print(f"Error watching mech1 {measurement} blocks: {e}")
+                    blocks[field] = self.state[field]
+            if watched and (self.state["version"] == 0 or any(blocks[f] != self.state[f] for f in fields)):
+                self.state = {"version": self.state["version"] + 1, **blocks}
+                changed, self._changed = self._changed, asyncio.Event()
+                changed.set()
+            await asyncio.sleep(self.interval)
+
+    async def wait(self, version, timeout):
+        """The state once its version differs from `version`, or the unchanged state after `timeout`"""
+        changed = self._changed
+        if self.state["version"] == version:
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.state
+
+
+block_watcher = BlockWatcher(interval=float(os.getenv("MECH1_WATCH_SECONDS", str(frame_cache.ttl))))
+
+# Comment lines keep idle streams from being closed by proxies
+SSE_HEARTBEAT_SECONDS = 20
+
+
+async def block_events(request: Request):
+    """SSE stream: the current block state on connect (once watched), then one `block` event per change"""
+    yield "retry: 5000\n\n"
+    version = 0
+    while not await request.is_disconnected():
+        state = await block_watcher.wait(version, SSE_HEARTBEAT_SECONDS)
+        if state["version"] == version:
+            yield ": keep-alive\n\n"
+            continue
+        version = state["version"]
+        yield f"event: block\nid: {version}\ndata: {json.dumps(state)}\n\n"
+
+
+@app.on_event("startup")
+async def start_watchers():
+    threading.Thread(target=watch_gist_urls, name="gist-watcher", daemon=True).start()
+    app.state.block_watcher_task = asyncio.create_task(block_watcher.run())
+
+
+@app.get("/api/mech1/stream")
+async def stream_blocks(request: Request):
+    """Server-Sent Events: pushes a `block` event whenever a new current_block is scored"""
+    headers = {
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    }
+    return StreamingResponse(block_events(request), media_type="text/event-stream", headers=headers)
+
+
+def render_strategies(block: Optional[int] = None):
+    payload = build_strategies(block)
+    return response_versions.render(("strategies", block), payload, block=payload.get("current_block"))
+
+
+@app.get("/api/mech1/strategies")
+async def get_strategies(request: Request, block: Optional[int] = None):
+    """Get all strategies for a given block (or latest if not specified)"""
+    return conditional_json(request, await run_blocking(render_strategies, block))
+
+
 @app.get("/api/mech1/code/{gist_id}")
 async def get_strategy_code(gist_id: str):
     """Fetch code content for a specific gist"""
     gist_url = f"https://gist.github.com/{gist_id}"
-    return fetch_gist_code(gist_url)
+    return await run_blocking(fetch_gist_code, gist_url)
 
 
 @app.get("/api/mech1/blocks")
 async def get_available_blocks():
     """Get list of available blocks"""
-    _, _, _, current_block, all_blocks = load_mechanism1_metrics(None)
+    _, _, _, current_block, all_blocks = await run_blocking(load_mechanism1_metrics, None)
     return {
         "current_block": current_block,
         "available_blocks": [int(b) for b in all_blocks]
     }
 
 
-@app.get("/api/mech1/history")
-async def get_historical_metrics():
-    """Get historical best metrics per block for miners only (excluding benchmarks).
-    Returns best loss (min), best communication (min), best throughput (max) per block."""
-    try:
-        query = f"""
-        from(bucket: "{INFLUXDB_BUCKET}")
-          |> range(start: -30d)
-          |> filter(fn: (r) => r._measurement == "{INFLUXDB_MEASUREMENT}")
-          |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-        """
-        df = query_api.query_data_frame(query)
-
-        if isinstance(df, list):
-            df = pd.concat(df)
-        if df.empty:
-            return {"history": [], "next_eval_block": None, "blocks_until_eval": None}
+SECONDS_PER_BLOCK = 12
+DEFAULT_EVAL_INTERVAL = 3500  # fallback if not enough data
+
+
+def block_bests(block_df):
+    """This epoch's best loss (min), communication (min) and throughput (max)"""
+    losses = block_df["loss"].dropna() if "loss" in block_df.columns else pd.Series()
+    comms = block_df["communication"].dropna() if "communication" in block_df.columns else pd.Series()
+    throughputs = block_df["throughput"].dropna() if "throughput" in block_df.columns else pd.Series()
+
+    return (
+        float(losses.min()) if len(losses) > 0 else None,
+        int(comms.min()) if len(comms) > 0 else None,
+        int(throughputs.max()) if len(throughputs) > 0 else None,
+    )
+
+
+class HistorySeries:
+    """
+    Materialized /api/mech1/history series (miners only, running bests per block).
+
+    Built once from a BlockIndex and afterwards only extended: when the cache
+    hands over a new index, blocks from the last one already stored onward are
+    (re)computed, starting from the stored running bests. It is rebuilt from
+    scratch only when the config of the latest block changes or the oldest
+    block leaves the 30-day window. The eval interval and last eval time are
+    derived when the series changes, so reads are constant-time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.index = None
+        self.first_block = None
+        self.latest_block = None
+        self.config = None
+        self.history = []
+        self.eval_interval = DEFAULT_EVAL_INTERVAL
+        self.last_eval_time = None
+
+    def _matches(self, df, start, end):
+        """Mask of rows [start, end) that have the current config"""
+        matches = np.ones(end - start, dtype=bool)
+        for field, value in self.config.items():
+            if field in df.columns and value:
+                matches &= (df[field].iloc[start:end].astype(str) == value).to_numpy()
+        return matches
+
+    def update(self, index):
+        with self._lock:
+            if index is self.index:
+                return
+            df = index.df
+            latest_df = index.rows(index.latest)
+            config = {}
+            for field in CONFIG_FIELDS:
+                if field in latest_df.columns:
+                    val = latest_df[field].iloc[0] if len(latest_df) > 0 else None
+                    config[field] = str(val) if pd.notna(val) else None
+
+            first_block = int(index.blocks[0])
+            if config != self.config or first_block != self.first_block:
+                self.config, self.first_block, self.history = config, first_block, []
+            else:
+                # The last stored block may have gained rows: recompute it
+                while self.history and self.history[-1]["block"] >= self.latest_block:
+                    self.history.pop()
+            from_block = self.history[-1]["block"] + 1 if self.history else first_block
+            self.latest_block = index.latest
+            self.last_eval_time = None
+
+            running = self.history[-1] if self.history else {}
+            running_best_loss = running.get("_loss")
+            running_best_comm = running.get("best_communication")
+            running_best_throughput = running.get("best_throughput")
+
+            first = int(np.searchsorted(index.blocks, from_block))
+            if first < len(index.blocks):
+                offset = int(index.starts[first])
+                matches = self._matches(df, offset, len(df))
+                for block, start, end in list(index.spans())[first:]:
+                    block_matches = matches[start - offset:end - offset]
+                    if not block_matches.any():
+                        continue
+                    block_df = df.iloc[start:end][block_matches]
+                    epoch_best_loss, epoch_best_comm, epoch_best_throughput = block_bests(block_df)
+
+                    # Update running best: keep the better value (lower for loss/comm, higher for throughput)
+                    if epoch_best_loss is not None:
+                        if running_best_loss is None or epoch_best_loss < running_best_loss:
+                            running_best_loss = epoch_best_loss
+
+                    if epoch_best_comm is not None:
+                        if running_best_comm is None or epoch_best_comm < running_best_comm:
+                            running_best_comm = epoch_best_comm
+
+                    if epoch_best_throughput is not None:
+                        if running_best_throughput is None or epoch_best_throughput > running_best_throughput:
+                            running_best_throughput = epoch_best_throughput
+
+                    # Store the running best (cumulative best up to this epoch)
+                    self.history.append({
+                        "block": int(block),
+                        "best_loss": round(running_best_loss, 4) if running_best_loss is not None else None,
+                        "best_communication": running_best_comm,
+                        "best_throughput": running_best_throughput,
+                        "miner_count": len(block_df),
+                        "_loss": running_best_loss,  # unrounded, to continue from
+                    })
+                    if block == self.latest_block and "_time" in block_df.columns:
+                        self.last_eval_time = self._eval_time(block_df)
+
+            # Eval interval from the average of the last 3 block intervals (or all if less than 3)
+            if len(self.history) >= 2:
+                blocks = [h["block"] for h in self.history[-4:]]
+                recent_diffs = [blocks[i+1] - blocks[i] for i in range(len(blocks)-1)]
+                self.eval_interval = int(round(sum(recent_diffs) / len(recent_diffs)))
+            else:
+                self.eval_interval = DEFAULT_EVAL_INTERVAL
+            self.index = index
+
+    @staticmethod
+    def _eval_time(block_df):
+        last_eval_time = pd.to_datetime(block_df["_time"].iloc[0])
+        if last_eval_time.tzinfo is None:
+            return last_eval_time.tz_localize('UTC')
+        return last_eval_time.tz_convert('UTC')
+
+    def payload(self):
+        """The /history response for the stored series"""
+        with self._lock:
+            history = [{k: v for k, v in h.items() if k != "_loss"} for h in self.history]
+            if not history:
+                return {"history": [], "next_eval_block": None, "blocks_until_eval": None, "config": self.config}
+
+            next_eval_block = int(self.latest_block) + self.eval_interval
+            if self.last_eval_time is not None:
+                next_eval_time = self.last_eval_time + timedelta(seconds=self.eval_interval * SECONDS_PER_BLOCK)
+                seconds_until_eval = max(0, (next_eval_time - datetime.now(timezone.utc)).total_seconds())
+                blocks_until_eval = int(seconds_until_eval / SECONDS_PER_BLOCK)
+                next_eval_timestamp = next_eval_time.isoformat()
+                last_eval_timestamp = self.last_eval_time.isoformat()
+            else:
+                # Fallback if no timestamp available
+                blocks_until_eval = self.eval_interval
+                next_eval_timestamp = None
+                last_eval_timestamp = None
+
+            return {
+                "history": history,
+                "current_block": int(self.latest_block),
+                "next_eval_block": next_eval_block,
+                "blocks_until_eval": blocks_until_eval,
+                "eval_interval": self.eval_interval,
+                "next_eval_timestamp": next_eval_timestamp,
+                "last_eval_timestamp": last_eval_timestamp,
+                "config": self.config
+            }
 
-        df = df.drop(
-            columns=[c for c in df.columns if c in ["result", "table", "_start", "_stop", "_measurement"]], 
-            errors="ignore"
-        )
 
-        # Convert current_block to numeric
-        if "current_block" not in df.columns:
+history_series = HistorySeries()
+
+
+def build_historical_metrics():
+    """Historical best metrics per block for miners only (excluding benchmarks).
+    Returns best loss (min), best communication (min), best throughput (max) per block."""
+    try:
+        index = frame_cache.get(INFLUXDB_MEASUREMENT)
+        if index.empty:
             return {"history": [], "next_eval_block": None, "blocks_until_eval": None}
-        
-        df["current_block"] = pd.to_numeric(df["current_block"], errors="coerce")
-        
-        # Get the current metadata config from the latest block
-        latest_block = df["current_block"].max()
-        latest_df = df[df["current_block"] == latest_block]
-        
-        # Extract current config
-        current_config = {}
-        for field in ["dataset", "max_steps", "model_size", "number_of_nodes"]:
-            if field in latest_df.columns:
-                val = latest_df[field].iloc[0] if len(latest_df) > 0 else None
-                current_config[field] = str(val) if pd.notna(val) else None
-        
-        # Filter by current config to get comparable historical data
-        filtered_df = df.copy()
-        for field, value in current_config.items():
-            if field in filtered_df.columns and value:
-                filtered_df = filtered_df[filtered_df[field].astype(str) == value]
-        
-        if filtered_df.empty:
-            return {"history": [], "next_eval_block": None, "blocks_until_eval": None, "config": current_config}
-        
-        # Group by block and compute best metrics (miners only - excluding benchmarks would need benchmark_flag)
-        # Since this is hotkey_scores measurement, these are all miners
-        history = []
-        
-        # Track running best values across epochs
-        running_best_loss = None
-        running_best_comm = None
-        running_best_throughput = None
-        
-        for block in sorted(filtered_df["current_block"].unique()):
-            block_df = filtered_df[filtered_df["current_block"] == block]
-            
-            # Compute this epoch's best metrics
-            losses = block_df["loss"].dropna() if "loss" in block_df.columns else pd.Series()
-            comms = block_df["communication"].dropna() if "communication" in block_df.columns else pd.Series()
-            throughputs = block_df["throughput"].dropna() if "throughput" in block_df.columns else pd.Series()
-            
-            epoch_best_loss = float(losses.min()) if len(losses) > 0 else None
-            epoch_best_comm = int(comms.min()) if len(comms) > 0 else None
-            epoch_best_throughput = int(throughputs.max()) if len(throughputs) > 0 else None
-            
-            # Update running best: keep the better value (lower for loss/comm, higher for throughput)
-            if epoch_best_loss is not None:
-                if running_best_loss is None or epoch_best_loss < running_best_loss:
-                    running_best_loss = epoch_best_loss
-            
-            if epoch_best_comm is not None:
-                if running_best_comm is None or epoch_best_comm < running_best_comm:
-                    running_best_comm = epoch_best_comm
-            
-            if epoch_best_throughput is not None:
-                if running_best_throughput is None or epoch_best_throughput > running_best_throughput:
-                    running_best_throughput = epoch_best_throughput
-            
-            # Store the running best (cumulative best up to this epoch)
-            history.append({
-                "block": int(block),
-                "best_loss": round(running_best_loss, 4) if running_best_loss is not None else None,
-                "best_communication": running_best_comm,
-                "best_throughput": running_best_throughput,
-                "miner_count": len(block_df)
-            })
-        
-        # Calculate eval interval dynamically from the average difference between consecutive blocks
-        SECONDS_PER_BLOCK = 12
-        DEFAULT_EVAL_INTERVAL = 3500  # fallback if not enough data
-        
-        # Calculate average block interval from history (last 3 intervals for responsiveness)
-        if len(history) >= 2:
-            blocks = [h["block"] for h in history]
-            block_diffs = [blocks[i+1] - blocks[i] for i in range(len(blocks)-1)]
-            # Use the average of the last 3 intervals (or all if less than 3)
-            recent_diffs = block_diffs[-3:] if len(block_diffs) >= 3 else block_diffs
-            avg_interval = sum(recent_diffs) / len(recent_diffs)
-            EVAL_INTERVAL = int(round(avg_interval))
-        else:
-            EVAL_INTERVAL = DEFAULT_EVAL_INTERVAL
-        
-        # Get the timestamp of the last evaluation
-        last_eval_time = None
-        if "_time" in filtered_df.columns:
-            last_eval_df = filtered_df[filtered_df["current_block"] == latest_block]
-            if not last_eval_df.empty:
-                last_eval_time = pd.to_datetime(last_eval_df["_time"].iloc[0])
-                if last_eval_time.tzinfo is None:
-                    last_eval_time = last_eval_time.tz_localize('UTC')
-                else:
-                    last_eval_time = last_eval_time.tz_convert('UTC')
-        
-        # Calculate next eval time and remaining time
-        next_eval_block = int(latest_block) + EVAL_INTERVAL
-        
-        if last_eval_time:
-            from datetime import timedelta
-            eval_duration = timedelta(seconds=EVAL_INTERVAL * SECONDS_PER_BLOCK)
-            next_eval_time = last_eval_time + eval_duration
-            
-            # Calculate seconds until next eval
-            from datetime import datetime, timezone
-            now = datetime.now(timezone.utc)
-            seconds_until_eval = max(0, (next_eval_time - now).total_seconds())
-            blocks_until_eval = int(seconds_until_eval / SECONDS_PER_BLOCK)
-            
-            next_eval_timestamp = next_eval_time.isoformat()
-            last_eval_timestamp = last_eval_time.isoformat()
-        else:
-            # Fallback if no timestamp available
-            blocks_until_eval = EVAL_INTERVAL
-            next_eval_timestamp = None
-            last_eval_timestamp = None
-        
-        return {
-            "history": history,
-            "current_block": int(latest_block),
-            "next_eval_block": next_eval_block,
-            "blocks_until_eval": blocks_until_eval,
-            "eval_interval": EVAL_INTERVAL,
-            "next_eval_timestamp": next_eval_timestamp,
-            "last_eval_timestamp": last_eval_timestamp,
-            "config": current_config
-        }
+        history_series.update(index)
+        return history_series.payload()
     except Exception as e:
         print(f"Error loading historical metrics: {e}")
         return {"history": [], "error": str(e)}
 
 
+def render_historical_metrics():
+    payload = build_historical_metrics()
+    return response_versions.render(
+        ("history",), payload, block=payload.get("current_block"), volatile=("blocks_until_eval",)
+    )
+
+
+@app.get("/api/mech1/history")
+async def get_historical_metrics(request: Request):
+    """Get historical best metrics per block for miners only (excluding benchmarks)"""
+    return conditional_json(request, await run_blocking(render_historical_metrics))
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -0,0 +1,244 @@
+"""
+Block-sorted indexes over the pivoted mech1 measurements.
+
+BlockIndex serves "rows of block X" for hotkey_scores; BenchmarkIndex groups
+benchmark_scores by run config and keeps, per block, only the latest row of
+each benchmark hotkey, so "benchmarks as of block X for config Y" is a dict
+lookup plus a binary search instead of filtering the whole table.
+IncrementalFrame keeps such an index up to date by querying mostly new rows.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+CONFIG_FIELDS = ("dataset", "max_steps", "model_size", "number_of_nodes")
+
+
+class BlockIndex:
+    """
+    Rows of a measurement sorted by current_block once, with a sorted array of
+    distinct blocks and the [start, end) row range of each, so a block lookup
+    is a binary search plus a slice instead of a mask over every row.
+    Missing current_block values count as block 0.
+    """
+
+    def __init__(self, df):
+        if df.empty or "current_block" not in df.columns:
+            self.df = df
+            self.blocks = np.array([], dtype=np.int64)
+            self.starts = self.ends = self.blocks
+            return
+        blocks = pd.to_numeric(df["current_block"], errors="coerce").fillna(0).astype(np.int64).to_numpy()
+        order = np.argsort(blocks, kind="stable")
+        self.df = df.iloc[order].reset_index(drop=True).assign(current_block=blocks[order])
+        self.blocks, self.starts = np.unique(blocks[order], return_index=True)
+        self.ends = np.r_[self.starts[1:], len(order)]
+
+    @property
+    def empty(self):
+        return len(self.blocks) == 0
+
+    @property
+    def latest(self):
+        return int(self.blocks[-1]) if len(self.blocks) else None
+
+    def descending_blocks(self):
+        return self.blocks[::-1].tolist()
+
+    def span(self, block):
+        """[start, end) row range of `block` (empty if absent)"""
+        i = np.searchsorted(self.blocks, block)
+        if i < len(self.blocks) and self.blocks[i] == block:
+            return int(self.starts[i]), int(self.ends[i])
+        return 0, 0
+
+    def floor(self, block):
+        """Latest block <= `block`, or None"""
+        i = np.searchsorted(self.blocks, block, side="right")
+        return int(self.blocks[i - 1]) if i else None
+
+    def rows(self, block):
+        start, end = self.span(block)
+        return self.df.iloc[start:end]
+
+    def spans(self):
+        """(block, start, end) in ascending block order"""
+        return zip(self.blocks.tolist(), self.starts.tolist(), self.ends.tolist())
+
+
+def _latest_per_hotkey(df):
+    """Newest row of each hotkey, newest first"""
+    if "_time" in df.columns:
+        df = df.sort_values("_time", ascending=False, kind="stable")
+    return df.drop_duplicates(subset=["hotkey"], keep="first")
+
+
+class BenchmarkIndex:
+    """
+    benchmark_scores rows keyed by config tuple (the CONFIG_FIELDS as strings,
+    None for a field the measurement doesn't have), each with a BlockIndex over
+    the latest row per (block, hotkey), plus per-config loss / communication /
+    throughput bests over every row.
+    """
+
+    def __init__(self, df):
+        self.configs = {}  # config tuple -> BlockIndex
+        self.bests = {}  # config tuple -> {"loss": min, "communication": min, "throughput": max}
+        self.blocks = np.array([], dtype=np.int64)
+        if df.empty:
+            return
+
+        blocks = (
+            pd.to_numeric(df["current_block"], errors="coerce").fillna(0).astype(np.int64)
+            if "current_block" in df.columns else pd.Series(0, index=df.index, dtype=np.int64)
+        )
+        df = df.assign(current_block=blocks)
+        if "_time" in df.columns:
+            df["_time"] = pd.to_datetime(df["_time"])
+            df = df.sort_values(["current_block", "_time"], ascending=[True, False], kind="stable")
+
+        fields = [f for f in CONFIG_FIELDS if f in df.columns]
+        keys = df[fields].astype(str) if fields else pd.DataFrame(index=df.index)
+        for values, group in df.groupby([keys[f] for f in fields], sort=False) if fields else [((), df)]:
+            values = iter(values if isinstance(values, tuple) else (values,))
+            key = tuple(next(values) if f in fields else None for f in CONFIG_FIELDS)
+            latest = group.drop_duplicates(subset=["current_block", "hotkey"], keep="first")
+            self.configs[key] = BlockIndex(latest)
+            self.bests[key] = {
+                "loss": group["loss"].min() if "loss" in group.columns else np.nan,
+                "communication": group["communication"].min() if "communication" in group.columns else np.nan,
+                "throughput": group["throughput"].max() if "throughput" in group.columns else np.nan,
+            }
+        self.blocks = np.unique(blocks.to_numpy())
+
+    @property
+    def empty(self):
+        return not self.configs
+
+    @property
+    def latest(self):
+        return int(self.blocks[-1]) if len(self.blocks) else None
+
+    def matching(self, metadata):
+        """Config keys agreeing with every field set in `metadata`"""
+        return [
+            key for key in self.configs
+            if all(
+                value is None or not metadata.get(field) or value == str(metadata[field])
+                for field, value in zip(CONFIG_FIELDS, key)
+            )
+        ]
+
+    def as_of(self, metadata, block=None):
+        """
+        Latest row per benchmark hotkey for `metadata` from the most recent block
+        <= `block` (or over all blocks if `block` is None). Falls back to every
+        config if none matches, and to the earliest block if none is <= `block`.
+        """
+        if self.empty:
+            return pd.DataFrame()
+        keys = self.matching(metadata)
+        if not keys:
+            print(f"No benchmarks match metadata {metadata}, using all available benchmarks")
+            keys = list(self.configs)
+
+        if block is None:
+            return _latest_per_hotkey(pd.concat([self.configs[k].df for k in keys]))
+
+        floors = [self.configs[k].floor(block) for k in keys]
+        found = [f for f in floors if f is not None]
+        if found:
+            chosen = max(found)
+            print(f"Using benchmarks from block {chosen} for selected block {block}")
+        else:
+            print(f"No benchmarks found for blocks <= {block}, using earliest available")
+            keys, chosen = list(self.configs), int(self.blocks[0])
+
+        parts = [self.configs[k].rows(chosen) for k in keys]
+        parts = [p for p in parts if not p.empty]
+        if len(parts) == 1:
+            return parts[0]
+        # Rows of one config are already unique per hotkey
+        return _latest_per_hotkey(pd.concat(parts))
+
+    def best_metrics(self, metadata):
+        """Best loss (min), communication (min) and throughput (max) over every row matching `metadata`"""
+        keys = self.matching(metadata)
+        if not keys:
+            return {}
+        bests = pd.DataFrame([self.bests[k] for k in keys])
+        metrics = {}
+        if pd.notna(bests["loss"].min()):
+            metrics["loss"] = round(float(bests["loss"].min()), 2)
+        if pd.notna(bests["communication"].min()):
+            metrics["communication"] = int(bests["communication"].min())
+        if pd.notna(bests["throughput"].max()):
+            metrics["throughput"] = int(bests["throughput"].max())
+        return metrics
+
+
+class IncrementalFrame:
+    """
+    Rows of a measurement over a sliding time window and the index built from
+    them. After a full load, refresh() only asks `query(start, stop)` (Flux
+    range bounds) for [high_water, now - lag), where high_water is the stop of
+    the previous query, so rows are never fetched twice and rows written a
+    little after their _time are still picked up. Every `full_resync_every`
+    refreshes the whole window is reloaded, so rows written later than the lag
+    self-heal. Rows that fell out of the window are dropped on every refresh
+    and the index is rebuilt only when the rows changed. Refreshes are
+    serialized, so it can be shared by request threads.
+    """
+
+    def __init__(self, query, build, window=pd.Timedelta(days=30), lag_seconds=5, full_resync_every=120):
+        self.query = query
+        self.build = build
+        self.window = window
+        self.lag = pd.Timedelta(seconds=lag_seconds)
+        self.full_resync_every = full_resync_every
+        self.refreshes = 0
+        self.high_water = None  # exclusive stop of the last query
+        self.rows = pd.DataFrame()
+        self.index = build(self.rows)
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        with self._lock:
+            self.refreshes += 1
+            full = self.high_water is None or (
+                self.full_resync_every and self.refreshes % self.full_resync_every == 0
+            )
+            stop = pd.Timestamp.now(tz="UTC") - self.lag
+            start = f"-{int(self.window.total_seconds())}s" if full else _flux_time(self.high_water)
+            df = self.query(start, _flux_time(stop))
+            if not df.empty and "_time" in df.columns:
+                df = df.assign(_time=pd.to_datetime(df["_time"], utc=True))
+            else:
+                df = pd.DataFrame()
+
+            if full:
+                rows, changed = df, True
+            elif df.empty:
+                rows, changed = self.rows, False
+            else:
+                # The ranges don't overlap; the dedup only guards against clock skew
+                rows = pd.concat([self.rows, df], ignore_index=True)
+                rows = rows.drop_duplicates(subset=[c for c in ("_time", "hotkey") if c in rows.columns], keep="last")
+                changed = len(rows) > len(self.rows)
+            if not rows.empty:
+                recent = rows["_time"] >= stop - self.window
+                if not recent.all():
+                    rows, changed = rows[recent], True
+
+            self.high_water = stop
+            if changed:
+                self.rows = rows.reset_index(drop=True)
+                self.index = self.build(self.rows)
+            return self.index
+
+
+def _flux_time(ts):
+    """Timestamp as an RFC3339 Flux time literal (UTC)"""
+    return ts.tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%S.%fZ")
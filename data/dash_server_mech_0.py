@@ -1,11 +1,14 @@
 import os
+import json
+import time
+import threading
 import dash
 import dash_ag_grid as dag
 import pandas as pd
 import numpy as np
 
 from dash import html, dcc, Input, Output, State
-from influxdb_client import InfluxDBClient
+from influx_client import get_query_api
 from dotenv import load_dotenv
 
 # ------------------------------
@@ -23,12 +26,9 @@ else:
 # InfluxDB Config
 # ------------------------------
 INFLUXDB_URL = os.getenv("INFLUXDB_URL")
-INFLUXDB_TOKEN = os.getenv("INFLUXDB_TOKEN_MECHANISM_0")
-INFLUXDB_ORG = os.getenv("INFLUXDB_ORG")
 INFLUXDB_BUCKET = os.getenv("INFLUXDB_BUCKET_MECHANISM_0")
 
-client = InfluxDBClient(url=INFLUXDB_URL, token=INFLUXDB_TOKEN, org=INFLUXDB_ORG)
-query_api = client.query_api()
+query_api = get_query_api(0, url=INFLUXDB_URL)
 
 def get_latest_uid_tracker():
     query = f'''from(bucket: "{INFLUXDB_BUCKET}") 
@@ -78,14 +78,66 @@ def get_latest_timestamp():
     # Ensure SAME timezone as get_latest_uid_tracker()
     return ts
 
+data = []
+
+def record_top_scores(df, last_updated_time):
+    data.append({str(last_updated_time) : df[["uid", "total.score", "train.score", "train.is_valid", "all_reduce.score"]].sort_values("train.score", ascending = False).head(10).to_dict(orient = "records")})
+    with open('/root/validator_scores.json', 'w') as file: json.dump(data , file, indent = 4)
+
+
+class ScoresPoller:
+    """
+    Owns the Influx freshness check for every viewer: one daemon thread calls
+    get_latest_timestamp() every `interval` seconds and reloads
+    get_latest_uid_tracker() only when it moved. Callbacks just read `snapshot`,
+    a (df, last_updated_time, records) tuple swapped in whole on each reload.
+    """
+
+    def __init__(self, df, last_updated_time, interval):
+        self.interval = interval
+        self.snapshot = (df, last_updated_time, df.to_dict("records"))
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mech0-scores-poller", daemon=True)
+                self._thread.start()
+
+    def refresh(self):
+        cached_df, cached_last_updated_time, _ = self.snapshot
+        latest_time = get_latest_timestamp()
+
+        # Only reload from InfluxDB if the timestamp changed
+        if not cached_df.empty and latest_time is not None and latest_time == cached_last_updated_time:
+            return False
+        df, last_updated_time = get_latest_uid_tracker()
+        df = df.reset_index(drop=True)
+        self.snapshot = (df, last_updated_time, df.to_dict("records"))
+        print("Cache refreshed from InfluxDB")
+        print(f"last_updated_time {last_updated_time}")
+        print(df[["total.score", "train.is_valid"]].head())
+        record_top_scores(df, last_updated_time)
+        return True
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                print("Reload error:", e)
+
+
 # Global cache
 cached_df, cached_last_updated_time = get_latest_uid_tracker()
 print(cached_df[["total.score", "train.score", "train.is_valid", "all_reduce.score"]].head())
 print(cached_last_updated_time)
-import json
-data = []
-data.append({str(cached_last_updated_time) : cached_df[["uid", "total.score", "train.score", "train.is_valid", "all_reduce.score"]].sort_values("train.score", ascending = False).head(10).to_dict(orient = "records")})
-with open('/root/validator_scores.json', 'w') as file: json.dump(data , file, indent = 4)
+record_top_scores(cached_df, cached_last_updated_time)
+
+scores_poller = ScoresPoller(cached_df, cached_last_updated_time, interval=float(os.getenv("MECH0_POLL_SECONDS", "10")))
+scores_poller.start()
 
 
 app = dash.Dash(__name__)
@@ -227,38 +279,18 @@ app.layout = html.Div([
     Input("interval", "n_intervals"),
 )
 def filter_and_reload_data(selected_uids, n_intervals):
-    print("Reload triggered by dropdown or timer")
-    print("Selected UIDs:", selected_uids)
-
-    global cached_df, cached_last_updated_time, data
-    
     try:
-
-        latest_time = get_latest_timestamp()
-
-        # Only reload from InfluxDB if the timestamp changed
-        if (cached_df.empty) or (latest_time is None) or (latest_time != cached_last_updated_time):
-            df, last_updated_time = get_latest_uid_tracker()
-            df = df.reset_index(drop=True)
-            cached_df = df
-            cached_last_updated_time = last_updated_time
-            print("Cache refreshed from InfluxDB")
-            print(f"last_updated_time {cached_last_updated_time}")
-            print(cached_df[["total.score", "train.is_valid"]].head())
-            data.append({str(cached_last_updated_time) : cached_df[["uid", "total.score", "train.score", "train.is_valid", "all_reduce.score"]].sort_values("train.score", ascending = False).head(10).to_dict(orient = "records")})
-            with open('/root/validator_scores.json', 'w') as file: json.dump(data , file, indent = 4)
-        else:
-            df = cached_df
-            print("Using cached data")
+        # Influx is polled by scores_poller, not per viewer
+        df, last_updated_time, records = scores_poller.snapshot
 
         # Apply UID filtering
         if selected_uids:
-            df = df[df["uid"].isin(selected_uids)]
+            records = df[df["uid"].isin(selected_uids)].to_dict("records")
 
         # Maintain sort state
         sort_state = [{"colId": "total.score", "sort": "desc"}]
         
-        return df.to_dict("records"), sort_state, f"Last updated: {cached_last_updated_time.tz_convert('Africa/Cairo').strftime('%Y-%m-%d %H:%M:%S %Z%z')}"
+        return records, sort_state, f"Last updated: {last_updated_time.tz_convert('Africa/Cairo').strftime('%Y-%m-%d %H:%M:%S %Z%z')}"
 
     except Exception as e:
         print("Reload error:", e)
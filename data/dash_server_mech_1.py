@@ -3,7 +3,8 @@ import dash
 import dash_ag_grid as dag
 import pandas as pd
 from dash import html, dcc, Input, Output
-from influxdb_client import InfluxDBClient
+from influx_client import get_query_api
+from block_index import BenchmarkIndex, IncrementalFrame
 from dotenv import load_dotenv
 
 # ------------------------------
@@ -21,14 +22,11 @@ else:
 # InfluxDB Config
 # ------------------------------
 INFLUXDB_URL = os.getenv("INFLUXDB_URL")
-INFLUXDB_ORG = os.getenv("INFLUXDB_ORG")
-INFLUXDB_TOKEN = os.getenv("INFLUXDB_TOKEN_MECHANISM_1")
 INFLUXDB_BUCKET = os.getenv("INFLUXDB_BUCKET_MECHANISM_1")
 INFLUXDB_MEASUREMENT = "hotkey_scores"
 INFLUXDB_BENCHMARK_MEASUREMENT = "benchmark_scores"
 
-client = InfluxDBClient(url=INFLUXDB_URL, token=INFLUXDB_TOKEN, org=INFLUXDB_ORG)
-query_api = client.query_api()
+query_api = get_query_api(1, url=INFLUXDB_URL)
 
 def shorten_middle(value, prefix=10, suffix=2):
     if value is None:
@@ -147,68 +145,36 @@ def load_mechanism1_metrics(current_block = None):
     return df, filtered_df, metadata, current_block
 
 
-def load_benchmark_metrics(metadata):
-    """
-    Load benchmark metrics matching the given metadata (dataset, max_steps, model_size, number_of_nodes).
-    Returns the latest benchmark data regardless of block.
+def query_benchmarks(start, stop):
+    """benchmark_scores rows in [start, stop) (Flux range bounds)"""
+    query = f"""
+    from(bucket: "{INFLUXDB_BUCKET}")
+      |> range(start: {start}, stop: {stop})
+      |> filter(fn: (r) => r._measurement == "{INFLUXDB_BENCHMARK_MEASUREMENT}")
+      |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
     """
-    try:
-        query = f"""
-        from(bucket: "{INFLUXDB_BUCKET}")
-          |> range(start: -30d)
-          |> filter(fn: (r) => r._measurement == "{INFLUXDB_BENCHMARK_MEASUREMENT}")
-          |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-        """
-        df = query_api.query_data_frame(query)
+    df = query_api.query_data_frame(query)
 
-        if isinstance(df, list):
-            df = pd.concat(df)
-        if df.empty:
-            return {}
-
-        # Drop metadata columns added by InfluxDB
-        df = df.drop(columns=[c for c in df.columns if c in ["result", "table", "_start", "_stop", "_measurement"]], errors="ignore")
-
-        # Filter by metadata to match the configuration
-        # Convert to string for comparison to handle type mismatches
-        if "dataset" in df.columns and metadata.get("dataset"):
-            df = df[df["dataset"].astype(str) == str(metadata["dataset"])]
-        if "max_steps" in df.columns and metadata.get("max_steps"):
-            df = df[df["max_steps"].astype(str) == str(metadata["max_steps"])]
-        if "model_size" in df.columns and metadata.get("model_size"):
-            df = df[df["model_size"].astype(str) == str(metadata["model_size"])]
-        if "number_of_nodes" in df.columns and metadata.get("number_of_nodes"):
-            df = df[df["number_of_nodes"].astype(str) == str(metadata["number_of_nodes"])]
+    if isinstance(df, list):
+        df = pd.concat(df) if df else pd.DataFrame()
+    # Drop metadata columns added by InfluxDB
+    return df.drop(columns=[c for c in df.columns if c in ["result", "table", "_start", "_stop", "_measurement"]], errors="ignore")
 
-        if df.empty:
-            return {}
 
-        # Convert _time for score extraction if needed
-        if "_time" in df.columns:
-            df["_time"] = pd.to_datetime(df["_time"]).dt.tz_convert("UTC")
+# Last 30 days of benchmark_scores; each reload only queries rows since the
+# previous one (with a periodic full reload) and rebuilds the index when the window changed
+benchmarks = IncrementalFrame(query_benchmarks, BenchmarkIndex)
 
-        # Aggregate benchmark metrics across all matching records:
-        # - Minimum loss (2 decimal places)
-        # - Minimum communication (with comma formatting)
-        # - Maximum throughput (with comma formatting)
-        benchmark_metrics = {}
-        
-        if "loss" in df.columns:
-            loss_values = df["loss"].dropna()
-            if not loss_values.empty:
-                benchmark_metrics["loss"] = round(float(loss_values.min()), 2)
-        
-        if "communication" in df.columns:
-            comm_values = df["communication"].dropna()
-            if not comm_values.empty:
-                benchmark_metrics["communication"] = int(comm_values.min())
-        
-        if "throughput" in df.columns:
-            throughput_values = df["throughput"].dropna()
-            if not throughput_values.empty:
-                benchmark_metrics["throughput"] = int(throughput_values.max())
 
-        return benchmark_metrics
+def load_benchmark_metrics(metadata):
+    """
+    Load benchmark metrics matching the given metadata (dataset, max_steps, model_size, number_of_nodes).
+    Returns the latest benchmark data regardless of block.
+    """
+    try:
+        # Best loss (min, 2 decimals), communication (min) and throughput (max)
+        # across all matching records
+        return benchmarks.refresh().best_metrics(metadata)
     except Exception as e:
         print(f"Error loading benchmark metrics: {e}")
         return {}
@@ -1,14 +1,19 @@
 from influxdb_client import InfluxDBClient
+from influx_client import get_influx_client
 import pandas as pd
 import numpy as np
 import os
 import json
 import warnings
 from influxdb_client.client.warnings import MissingPivotFunction
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 import time
+import bisect
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import bittensor as bt
 from dotenv import load_dotenv
+from downsample import DOWNSAMPLE_METHODS, downsample_miners
 
 
 warnings.simplefilter("ignore", MissingPivotFunction)
@@ -21,205 +26,342 @@ if os.path.exists(ENV_PATH):
 else:
     raise FileNotFoundError(f"Warning: .env file not found at expected location: {ENV_PATH}")
 
+INFLUXDB_URL = "http://161.97.156.125:8086"
+
 def initialize_influx_client() -> InfluxDBClient:
-    client = InfluxDBClient(
-        url="http://161.97.156.125:8086",
-        token=os.getenv("INFLUXDB_TOKEN_MECHANISM_0"),
-        org=os.getenv("INFLUXDB_ORG"),
-        timeout=260_000
-    )
-    return client
+    """Return the shared pooled mechanism-0 client (created once, reused every cycle)"""
+    return get_influx_client(0, url=INFLUXDB_URL, timeout=260_000)
 
 counter = 0
 
-def get_active_miners_bt_metagraph() -> int:
-    metagraph = bt.metagraph(netuid=38)
-    active_miners = len([
-        x for x in range(metagraph.n)
-        if metagraph.axons[x].ip != "0.0.0.0" and metagraph.stake[x] <= 1000
-    ])
-    return active_miners
-
-def get_latest_run_and_epoch_validator_influx(days: int = 30) -> tuple[str, int]:
+# ------------------------------
+# Concurrent fan-out
+# ------------------------------
+# Shared bounded pool for the independent Influx / metagraph fetches
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("COLLECTOR_MAX_WORKERS", "8")),
+    thread_name_prefix="collector",
+)
+
+# Max seconds to wait for each source before falling back to its last good value
+SOURCE_TIMEOUTS = {
+    "active_miners": 120,
+    "global_loss": 90,
+    "validators": 90,
+    "miners": 120,
+    "training_metrics": 120,
+    "allreduce_operations": 90,
+    "evaluation_metrics": 90,
+}
+DEFAULT_SOURCE_TIMEOUT = 90
+
+_last_good = {}
+
+def _collect(futures: dict, defaults: dict = None) -> tuple[dict, list]:
     """
-    Return (latest_run_id, latest_epoch_for_that_run).
-    Logic stays clear and debuggable.
-    Searches across multiple measurements to find run_ids.
+    Wait for {source: future}, giving each source SOURCE_TIMEOUTS[source]
+    seconds counted from the start of the wait (so the total wait is the
+    slowest source, not the sum). A source that fails or times out falls back
+    to its last good result (or defaults[source]) and is returned in `stale`.
+    Timed-out work is not cancelled; it finishes in the background.
     """
-    client = initialize_influx_client()
-    query_api = client.query_api()
+    defaults = defaults or {}
+    started = time.monotonic()
+    results, stale = {}, []
+    for source, future in futures.items():
+        timeout = SOURCE_TIMEOUTS.get(source, DEFAULT_SOURCE_TIMEOUT)
+        try:
+            results[source] = future.result(timeout=max(0.0, timeout - (time.monotonic() - started)))
+            _last_good[source] = results[source]
+            continue
+        except FutureTimeoutError:
+            print(f"Warning: {source} did not finish within {timeout}s, using last good value")
+        except Exception as e:
+            print(f"Warning: {source} failed, using last good value: {e}")
+        results[source] = _last_good.get(source, defaults.get(source))
+        stale.append(source)
+    return results, stale
+
+BLOCK_SECONDS = 12
+
+class MetagraphSnapshot:
+    """
+    Background-refreshed snapshot of the subnet metagraph, kept as compact arrays.
 
-    # Search across multiple measurements that might contain run_id
-    # miner_scores has run_id as a field
-    # evaluation_metrics has run_id in the tag field (format: "{run_id}.{epoch}.{step}")
-    run_ids = []
-    
-    # Query miner_scores for run_id field
-    flux_run_ids_miner = f'''
-    from(bucket: "mechanism-0")
-      |> range(start: -{days}d)
-      |> filter(fn: (r) => r._measurement == "miner_scores")
-      |> filter(fn: (r) => exists r.run_id)
-      |> keep(columns: ["run_id"])
-      |> group()
-      |> distinct(column: "run_id")
-    '''
-    
-    try:
-        result_run = query_api.query(org="DSTRBTD", query=flux_run_ids_miner)
-        measurement_run_ids = [r.values["_value"] for t in result_run for r in t.records]
-        run_ids.extend(measurement_run_ids)
-    except Exception as e:
-        print(f"Warning: Could not query miner_scores for run_ids: {e}")
-    
-    # Query evaluation_metrics - extract run_id from tag field (tag format: "{run_id}.{epoch}.{step}")
-    flux_run_ids_eval = f'''
-    import "strings"
-    from(bucket: "mechanism-0")
-      |> range(start: -{days}d)
-      |> filter(fn: (r) => r._measurement == "evaluation_metrics")
-      |> filter(fn: (r) => exists r.tag)
-      |> map(fn: (r) => ({{
-          r with run_id: strings.split(v: r.tag, t: ".")[0]
-        }}))
-      |> keep(columns: ["run_id"])
-      |> group()
-      |> distinct(column: "run_id")
-    '''
-    
-    try:
-        result_run = query_api.query(org="DSTRBTD", query=flux_run_ids_eval)
-        measurement_run_ids = [r.values["_value"] for t in result_run for r in t.records]
-        run_ids.extend(measurement_run_ids)
-    except Exception as e:
-        print(f"Warning: Could not query evaluation_metrics for run_ids: {e}")
-    
-    # Remove duplicates and convert to int for proper sorting
-    run_ids = list(set(run_ids))
-    
-    if not run_ids:
-        raise ValueError(f"No run_ids found in the past {days} days in miner_scores or evaluation_metrics.")
+    A daemon thread re-syncs one metagraph every `refresh_blocks` blocks and
+    stores only what the dashboard needs (serving flag and stake per uid), so
+    collection cycles read the active-miner count from memory instead of
+    doing a chain sync. A failed sync keeps the previous snapshot; status()
+    reports its block, sync time and whether it is stale.
+    """
 
-    latest_run_id = max(run_ids, key=lambda x: int(x))
+    def __init__(self, netuid: int = 38, refresh_blocks: int = None, max_stake: float = 1000):
+        self.netuid = netuid
+        self.refresh_blocks = refresh_blocks or int(os.getenv("METAGRAPH_REFRESH_BLOCKS", "25"))
+        self.max_stake = max_stake
+        self.serving = None  # bool per uid: axon has a non-zero IP
+        self.stake = None  # float32 per uid
+        self.block = None
+        self.synced_at = None
+        self._metagraph = None
+        self._ready = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def interval(self) -> int:
+        return self.refresh_blocks * BLOCK_SECONDS
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="metagraph-refresh", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            started = time.monotonic()
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Warning: metagraph sync failed, keeping snapshot from block {self.block}: {e}")
+            time.sleep(max(BLOCK_SECONDS, self.interval - (time.monotonic() - started)))
+
+    def refresh(self):
+        if self._metagraph is None:
+            self._metagraph = bt.metagraph(netuid=self.netuid)
+        else:
+            self._metagraph.sync()
+        metagraph = self._metagraph
+        serving = np.fromiter((axon.ip != "0.0.0.0" for axon in metagraph.axons), dtype=bool, count=len(metagraph.axons))
+        stake = np.asarray(metagraph.stake, dtype=np.float32)
+        # Swap in a consistent set of arrays at once
+        self.serving, self.stake = serving, stake
+        self.block = int(metagraph.block)
+        self.synced_at = datetime.now(timezone.utc)
+        self._ready.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Start the refresher if needed and wait for the first snapshot"""
+        self.start()
+        return self._ready.wait(timeout)
+
+    def active_miners(self) -> int:
+        serving, stake = self.serving, self.stake
+        return int(np.count_nonzero(serving & (stake <= self.max_stake)))
+
+    def status(self) -> dict:
+        """Block and sync time of the snapshot; stale once two refreshes were missed"""
+        synced_at = self.synced_at
+        return {
+            "block": self.block,
+            "synced_at": synced_at.isoformat() if synced_at else None,
+            "stale": synced_at is None or (datetime.now(timezone.utc) - synced_at).total_seconds() > 2 * self.interval + BLOCK_SECONDS,
+        }
 
-    # Search for epochs across multiple measurements
-    epochs = []
-    
-    # Query miner_scores for epochs
-    flux_epochs_miner = f'''
-    from(bucket: "mechanism-0")
-      |> range(start: -30d)
-      |> filter(fn: (r) => r._measurement == "miner_scores")
-      |> filter(fn: (r) => r.run_id == "{latest_run_id}")
-      |> filter(fn: (r) => exists r.epoch)
-      |> keep(columns: ["epoch"])
-      |> group()
-      |> distinct(column: "epoch")
-    '''
-    
-    try:
-        result_epochs = query_api.query(org="DSTRBTD", query=flux_epochs_miner)
-        measurement_epochs = [int(r.values["_value"]) for t in result_epochs for r in t.records]
-        epochs.extend(measurement_epochs)
-    except Exception as e:
-        print(f"Warning: Could not query miner_scores for epochs: {e}")
-    
-    # Query evaluation_metrics - extract epoch from tag field (tag format: "{run_id}.{epoch}.{step}")
-    flux_epochs_eval = f'''
-    import "strings"
-    from(bucket: "mechanism-0")
-      |> range(start: -30d)
-      |> filter(fn: (r) => r._measurement == "evaluation_metrics")
-      |> filter(fn: (r) => exists r.tag)
-      |> map(fn: (r) => ({{
-          r with run_id: strings.split(v: r.tag, t: ".")[0],
-          epoch: int(v: strings.split(v: r.tag, t: ".")[1])
-        }}))
-      |> filter(fn: (r) => r.run_id == "{latest_run_id}")
-      |> keep(columns: ["epoch"])
-      |> group()
-      |> distinct(column: "epoch")
-    '''
-    
+_metagraph = MetagraphSnapshot(netuid=38)
+
+def get_active_miners_bt_metagraph() -> int:
+    """Active-miner count from the background metagraph snapshot (waits for the first sync)"""
+    if not _metagraph.wait(timeout=SOURCE_TIMEOUTS["active_miners"]):
+        raise TimeoutError("first metagraph sync has not finished yet")
+    return _metagraph.active_miners()
+
+def _run_epoch_maxima(query_api, flux: str, measurement: str):
+    """Run a per-run max(epoch) query; returns [(run_id, epoch)], or None if the source failed"""
     try:
-        result_epochs = query_api.query(org="DSTRBTD", query=flux_epochs_eval)
-        measurement_epochs = [int(r.values["_value"]) for t in result_epochs for r in t.records]
-        epochs.extend(measurement_epochs)
+        result = query_api.query(org="DSTRBTD", query=flux)
+        return [(str(r.values["run_id"]), int(r.values["epoch"])) for t in result for r in t.records]
     except Exception as e:
-        print(f"Warning: Could not query evaluation_metrics for epochs: {e}")
-    
-    # Remove duplicates
-    epochs = list(set(epochs))
+        print(f"Warning: Could not query {measurement} for run_ids/epochs: {e}")
+        return None
 
-    if not epochs:
-        raise ValueError(f"No epochs found for run_id {latest_run_id} in miner_scores or evaluation_metrics")
+class RunEpochIndex:
+    """
+    In-memory index of run_id -> latest epoch, fed by miner_scores (run_id and
+    epoch tags) and evaluation_metrics (tag "{run_id}.{epoch}.{step}").
+
+    The first refresh backfills the last `days`; after that each refresh only
+    reduces rows in [high_water, now - lag) to one max epoch per run and
+    merges them, so the latest run and epoch are read in O(1). If a source
+    fails its window is retried on the next refresh (maxima merge
+    idempotently). The index is rebuilt every `rebuild_every` refreshes so
+    runs that left the window drop out, as with the old distinct queries.
+    """
 
-    latest_epoch = max(epochs)
+    def __init__(self, days: int = 30, lag_seconds: int = 5, rebuild_every: int = 720):
+        self.days = days
+        self.lag = timedelta(seconds=lag_seconds)
+        self.rebuild_every = rebuild_every
+        self.refreshes = 0
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.high_water = None
+        self._epochs = {}  # run_id -> latest epoch
+        self._latest_run = None
+
+    def _queries(self, start: str, stop: str) -> list:
+        flux_miner = f'''
+        from(bucket: "mechanism-0")
+          |> range(start: {start}, stop: {stop})
+          |> filter(fn: (r) => r._measurement == "miner_scores")
+          |> filter(fn: (r) => exists r.run_id and exists r.epoch)
+          |> map(fn: (r) => ({{run_id: r.run_id, epoch: int(v: r.epoch)}}))
+          |> group(columns: ["run_id"])
+          |> max(column: "epoch")
+        '''
+        flux_eval = f'''
+        import "strings"
+        from(bucket: "mechanism-0")
+          |> range(start: {start}, stop: {stop})
+          |> filter(fn: (r) => r._measurement == "evaluation_metrics")
+          |> filter(fn: (r) => exists r.tag)
+          |> map(fn: (r) => {{
+              parts = strings.split(v: r.tag, t: ".")
+              return {{run_id: parts[0], epoch: int(v: parts[1])}}
+            }})
+          |> group(columns: ["run_id"])
+          |> max(column: "epoch")
+        '''
+        return [(flux_miner, "miner_scores"), (flux_eval, "evaluation_metrics")]
 
-    return latest_run_id, latest_epoch
+    def _merge(self, maxima: list):
+        for run_id, epoch in maxima:
+            try:
+                run_number = int(run_id)
+            except ValueError:
+                continue
+            if epoch > self._epochs.get(run_id, -1):
+                self._epochs[run_id] = epoch
+            if self._latest_run is None or run_number > int(self._latest_run):
+                self._latest_run = run_id
+
+    def refresh(self):
+        """Merge per-run epoch maxima of the rows written since the last refresh"""
+        with self._lock:
+            self.refreshes += 1
+            if self.rebuild_every and self.refreshes % self.rebuild_every == 0:
+                self._reset()
+
+            stop = datetime.now(timezone.utc) - self.lag
+            start = _flux_time(self.high_water) if self.high_water is not None else f"-{self.days}d"
+            query_api = initialize_influx_client().query_api()
+            results = list(_executor.map(
+                lambda args: _run_epoch_maxima(query_api, *args),
+                self._queries(start, _flux_time(stop)),
+            ))
+            for maxima in results:
+                self._merge(maxima or [])
+            if all(maxima is not None for maxima in results):
+                self.high_water = stop
+
+    def latest(self) -> tuple[str, int]:
+        """(latest_run_id, latest_epoch_for_that_run) from the index"""
+        if self._latest_run is None:
+            raise ValueError(f"No run_ids found in the past {self.days} days in miner_scores or evaluation_metrics.")
+        return self._latest_run, self._epochs[self._latest_run]
+
+_run_indexes = {}
 
+def get_latest_run_and_epoch_validator_influx(days: int = 30) -> tuple[str, int]:
+    """
+    Return (latest_run_id, latest_epoch_for_that_run).
+    Searches across miner_scores and evaluation_metrics through a RunEpochIndex
+    that only queries rows newer than its previous refresh.
+    """
+    index = _run_indexes.get(days)
+    if index is None:
+        index = _run_indexes[days] = RunEpochIndex(days=days)
+    index.refresh()
+    return index.latest()
 
-def get_global_model_loss_influx(run_id: str) -> dict:
+
+class GlobalLossSeries:
     """
-    Retrieve outer_steps vs. losses for fineweb task for given run_id.
-    Matches exact run_id.0.0 and run_id.x tags.
+    Append-only cache of the fineweb evaluation loss per outer step, per run.
+
+    The first update of a run backfills `days` of evaluation_metrics once;
+    every later update only fetches points in [high_water, now - lag) and
+    keeps the newest loss per outer step. A run whose previous update is
+    still in flight (e.g. a slow backfill) is not queried again meanwhile.
     """
-    client = initialize_influx_client()
-    query_api = client.query_api()
 
-    query = f"""
-    import "strings"
-    from(bucket: "mechanism-0")
-        |> range(start: -365d)
-        |> filter(fn: (r) => r._measurement == "evaluation_metrics")
-        |> filter(fn: (r) => r.tag == "{run_id}.0.0" or r.tag =~ /^{run_id}\\./)
-        |> filter(fn: (r) => r.task == "fineweb")
-        |> map(fn: (r) => ({{
-                r with outer_step: int(v: strings.split(v: r.tag, t: ".")[1])
-            }}))
-        |> group(columns: ["outer_step"])
-        |> sort(columns: ["_time"], desc: true)  // newest first
-        |> unique(column: "outer_step")          // keep only 1 per step
-        |> sort(columns: ["outer_step"])         // re-sort by step ascending
-    """
-
-    results = query_api.query(org="DSTRBTD", query=query)
-
-    records_list = []
-    for table in results:
-        for record in table.records:
-            tag = record.values.get("tag")
-            task = record.values.get("task")
-            score = record.get_value()
-            time = record.get_time()
-            try:
-                number_part = float(tag.split('.')[1])
-            except (IndexError, ValueError):
-                number_part = float('inf')
-            records_list.append((number_part, tag, task, score, time))
+    def __init__(self, days: int = 365, lag_seconds: int = 5):
+        self.days = days
+        self.lag = timedelta(seconds=lag_seconds)
+        self._lock = threading.Lock()
+        self._inflight = set()
+        self._high_water = {}  # run_id -> exclusive stop of the last merged window
+        self._points = {}  # run_id -> {outer_step: (time, loss)}
 
-    records_list.sort(key=lambda x: x[0])
+    def backfilled(self, run_id: str) -> bool:
+        return run_id in self._high_water
 
-    outer_steps = []
-    losses = []
-    for _, tag, task, score, time in records_list:
+    def _fetch(self, run_id: str, start: str, stop: datetime) -> list:
+        query = f"""
+        from(bucket: "mechanism-0")
+            |> range(start: {start}, stop: {_flux_time(stop)})
+            |> filter(fn: (r) => r._measurement == "evaluation_metrics")
+            |> filter(fn: (r) => r.tag =~ /^{run_id}\\./)
+            |> filter(fn: (r) => r.task == "fineweb")
+            |> keep(columns: ["_time", "_value", "tag"])
+        """
+        results = initialize_influx_client().query_api().query(org="DSTRBTD", query=query)
+        return [(r.values.get("tag"), r.get_time(), r.get_value()) for table in results for r in table.records]
+
+    def update(self, run_id: str):
+        """Fetch and merge the points written since the last update. Returns merged rows, or None if skipped."""
+        with self._lock:
+            if run_id in self._inflight:
+                return None
+            self._inflight.add(run_id)
+            last_seen = self._high_water.get(run_id)
         try:
-            outer_step = int(float(tag.split('.')[1]))
-        except Exception:
-            outer_step = None
-        if outer_step is not None:
-            outer_steps.append(outer_step)
-            losses.append(score)
-
-    result = {
-        "outer_steps": outer_steps,
-        "losses": losses,
-    }
-    
-    if not outer_steps or not losses:
+            stop = datetime.now(timezone.utc) - self.lag
+            start = _flux_time(last_seen) if last_seen is not None else f"-{self.days}d"
+            records = self._fetch(run_id, start, stop)
+            with self._lock:
+                points = self._points.setdefault(run_id, {})
+                for tag, ts, loss in records:
+                    try:
+                        outer_step = int(float(tag.split('.')[1]))
+                    except Exception:
+                        continue
+                    seen = points.get(outer_step)
+                    if seen is None or ts >= seen[0]:
+                        points[outer_step] = (ts, loss)
+                self._high_water[run_id] = stop
+            return len(records)
+        finally:
+            with self._lock:
+                self._inflight.discard(run_id)
+
+    def data(self, run_id: str) -> dict:
+        """{"outer_steps": [...], "losses": [...]} sorted by step (a fresh copy, safe to pad)"""
+        with self._lock:
+            points = self._points.get(run_id, {})
+            outer_steps = sorted(points)
+            losses = [points[step][1] for step in outer_steps]
+        return {"outer_steps": outer_steps, "losses": losses}
+
+_global_loss = GlobalLossSeries()
+
+def get_global_model_loss_influx(run_id: str) -> dict:
+    """
+    Retrieve outer_steps vs. losses for fineweb task for given run_id.
+    Matches exact run_id.0.0 and run_id.x tags. Served from the
+    GlobalLossSeries cache, which only queries points newer than its last update.
+    """
+    run_id = str(run_id)
+    if _global_loss.update(run_id) is None and not _global_loss.backfilled(run_id):
+        raise RuntimeError(f"global loss backfill for run_id {run_id} is still running")
+    result = _global_loss.data(run_id)
+
+    if not result["outer_steps"]:
         print(f"Warning: No global_loss_data found for run_id {run_id}")
-        print(f"  outer_steps count: {len(outer_steps)}, losses count: {len(losses)}")
-    
+
     return result
 
 def get_miner_influx_data(run_id: str = "6", epoch: int = 0, days: int = 30) -> dict:
@@ -232,6 +374,9 @@ def get_miner_influx_data(run_id: str = "6", epoch: int = 0, days: int = 30) ->
     query_api = client.query_api()
 
     try:
+        # Mean per (miner, epoch), positive-loss filter, int epochs and the
+        # (miner, epoch) ordering all happen server-side; the result is one
+        # table of three columns already in output order
         flux = f'''
         from(bucket: "mechanism-0")
             |> range(start: -{days}d)
@@ -240,6 +385,10 @@ def get_miner_influx_data(run_id: str = "6", epoch: int = 0, days: int = 30) ->
             |> filter(fn: (r) => r["run_id"] == "{run_id}")
             |> group(columns: ["miner_uid", "epoch", "run_id"])
             |> mean()
+            |> filter(fn: (r) => r._value > 0.0)
+            |> map(fn: (r) => ({{miner_uid: r.miner_uid, epoch: int(v: r.epoch), loss: r._value}}))
+            |> group()
+            |> sort(columns: ["miner_uid", "epoch"])
         '''
         df_train = query_api.query_data_frame(flux)
         if isinstance(df_train, list):
@@ -247,25 +396,29 @@ def get_miner_influx_data(run_id: str = "6", epoch: int = 0, days: int = 30) ->
     except Exception as e:
         print(f"Warning: Could not query miner data from training_metrics: {e}")
         return {}
-    
+
     if df_train.empty:
         print(f"Warning: No miner training data found for run_id {run_id} (training_metrics measurement may not exist)")
         return {}
 
-    df_train = df_train.rename(columns={"_value": "loss"})
-    df_train = df_train[["miner_uid", "run_id", "epoch", "loss"]].dropna().reset_index(drop=True)
-    df_train = df_train[df_train["loss"] > 0.0]
-    df_train["epoch"] = df_train["epoch"].astype(int)
-    df_train = df_train.sort_values(by=["epoch", "miner_uid"]).reset_index(drop=True)
+    return miners_from_frame(df_train)
 
-    miners_dict = {
-        str(miner_uid): {
-            "epoch": group["epoch"].tolist(),
-            "loss": group["loss"].tolist()
-        }
-        for miner_uid, group in df_train.groupby("miner_uid")
+def miners_from_frame(df: pd.DataFrame) -> dict:
+    """
+    Split rows sorted by (miner_uid, epoch) into per-miner epoch / loss series.
+    Each column is converted once; miners are slices at the uid boundaries.
+    """
+    uids = df["miner_uid"].astype(str).to_numpy()
+    epochs = df["epoch"].to_numpy().astype(np.int64).tolist()
+    losses = df["loss"].to_numpy(dtype=float).tolist()
+
+    starts = np.flatnonzero(np.r_[True, uids[1:] != uids[:-1]]).tolist()
+    ends = starts[1:] + [len(uids)]
+
+    return {
+        uids[start]: {"epoch": epochs[start:end], "loss": losses[start:end]}
+        for start, end in zip(starts, ends)
     }
-    return miners_dict
 
 def get_validator_influx_data(run_id: str = "6", epoch: int = 0, days: int = 30) -> dict:
     """
@@ -302,29 +455,329 @@ def get_validator_influx_data(run_id: str = "6", epoch: int = 0, days: int = 30)
         print(f"Warning: No validator data found for run_id {run_id} (allreduce_operations measurement may not exist)")
         return {}
 
-    df_allreduce["participating_miners"] = df_allreduce["participating_miners"].round().astype(int)
-    df_allreduce["succesful_miners"] = df_allreduce["participating_miners"] - df_allreduce["failed_miners"].fillna(0).astype(int)
-    df_allreduce["epoch"] = df_allreduce["epoch"].astype(int)
-    df_allreduce["run_id"] = run_id
-
-    validators_dict = {
-        str(validator_uid): {
-            "peers": {
-                "epoch": group.sort_values("epoch")["epoch"].tolist(),
-                "count": group.sort_values("epoch")["succesful_miners"].tolist()
-            },
-            "learning_rate": {
-                "epoch": group.sort_values("epoch")["epoch"].tolist(),
-                "value": [
-                    None if (isinstance(v, float) and np.isnan(v)) else v
-                    for v in group.sort_values("epoch")["learning_rate"].tolist()
-                ]
-            }
-        }
-        for validator_uid, group in df_allreduce.groupby("validator_uid")
+    return validators_from_frame(df_allreduce)
+
+def validators_from_frame(df: pd.DataFrame) -> dict:
+    """
+    Reshape pivoted allreduce rows (validator_uid, epoch, participating_miners,
+    failed_miners, learning_rate) into the per-validator peers / learning_rate
+    series: one sort of all rows by (validator, epoch) on integer codes, then
+    columnar extraction per validator. The incremental collector builds its
+    series with the same two steps (_grouped_epochs, _validator_points).
+    """
+    df = df.assign(epoch=df["epoch"].astype(np.int64))
+    validators = {}
+    for uid, epochs, values in _grouped_epochs(df, "validator_uid", VALIDATOR_FIELDS, np.fmax):
+        points = _validator_points({"epoch": epochs, **values}, 0)
+        if points["epoch"]:
+            validators[uid] = _validator_series(points)
+    return validators
+
+def _flux_time(ts: datetime) -> str:
+    """Format a datetime as an RFC3339 Flux time literal (UTC)"""
+    return ts.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+def _to_frame(result) -> pd.DataFrame:
+    """query_data_frame returns a list of frames when tables have different schemas"""
+    if isinstance(result, list):
+        return pd.concat(result, ignore_index=True) if result else pd.DataFrame()
+    return result
+
+def _grouped_epochs(df: pd.DataFrame, key: str, columns: tuple, combine):
+    """
+    Yield (key value, epochs, {column: values}) per distinct `key` (as str) of
+    `df` (integer epochs), epochs sorted and unique: rows of the same
+    (key, epoch) are combined with the `combine` ufunc (np.add, np.fmax).
+    Columns `df` lacks are NaN. Rows the query already sorted are not resorted.
+    """
+    codes, keys = pd.factorize(df[key].astype(str), sort=True)
+    epochs = df["epoch"].to_numpy(dtype=np.int64)
+    if np.all((codes[1:] > codes[:-1]) | ((codes[1:] == codes[:-1]) & (epochs[1:] >= epochs[:-1]))):
+        order = np.arange(len(codes))
+    else:
+        order = np.lexsort((epochs, codes))
+    codes, epochs = codes[order], epochs[order]
+    values = {
+        column: df[column].to_numpy(dtype=float)[order] if column in df.columns else np.full(len(order), np.nan)
+        for column in columns
     }
 
-    return validators_dict
+    firsts = np.flatnonzero(np.r_[True, (codes[1:] != codes[:-1]) | (epochs[1:] != epochs[:-1])])
+    codes, epochs = codes[firsts], epochs[firsts]
+    values = {column: combine.reduceat(v, firsts) for column, v in values.items()}
+
+    bounds = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]).tolist() + [len(codes)]
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        yield keys[codes[start]], epochs[start:end], {column: v[start:end] for column, v in values.items()}
+
+def _merge_epochs(state: dict, epochs: np.ndarray, values: dict, combine) -> int:
+    """
+    Merge sorted unique `epochs` and their `values` columns into `state`
+    ({"epoch": array, column: array, ...}), combining epochs present in both
+    with `combine`. Arrays are replaced, never modified in place. Returns the
+    index of the first epoch whose values changed; only that tail is rebuilt.
+    """
+    old = state.get("epoch")
+    if old is None:
+        state["epoch"] = epochs
+        state.update(values)
+        return 0
+    first = int(np.searchsorted(old, epochs[0]))
+    if first == len(old):
+        # New epochs only (the usual delta)
+        state["epoch"] = np.concatenate([old, epochs])
+        for column, new in values.items():
+            state[column] = np.concatenate([state[column], new])
+        return first
+
+    merged = np.union1d(old[first:], epochs)
+    at_old = np.searchsorted(merged, old[first:])
+    at_new = np.searchsorted(merged, epochs)
+    fill = np.nan if combine.identity is None else combine.identity
+    for column, new in values.items():
+        tail = np.full(len(merged), fill, dtype=float)
+        tail[at_old] = state[column][first:]
+        tail[at_new] = combine(tail[at_new], new)
+        state[column] = np.concatenate([state[column][:first], tail])
+    state["epoch"] = np.concatenate([old[:first], merged])
+    return first
+
+def _miner_points(state: dict, first: int) -> dict:
+    """Epoch / mean loss lists from index `first` on, positive losses only"""
+    count = state["count"][first:]
+    loss = np.divide(state["sum"][first:], count, out=np.zeros(len(count)), where=count > 0)
+    keep = loss > 0.0
+    return {"epoch": state["epoch"][first:][keep].tolist(), "loss": loss[keep].tolist()}
+
+VALIDATOR_FIELDS = ("participating_miners", "failed_miners", "learning_rate")
+
+def _validator_points(state: dict, first: int) -> dict:
+    """Epoch / peer count / learning rate lists from index `first` on, for epochs with participating_miners"""
+    participating = state["participating_miners"][first:]
+    keep = ~np.isnan(participating)
+    counts = np.rint(participating[keep]).astype(np.int64)
+    counts -= np.nan_to_num(state["failed_miners"][first:][keep]).astype(np.int64)
+    lr = state["learning_rate"][first:][keep]
+    return {
+        "epoch": state["epoch"][first:][keep].tolist(),
+        "count": counts.tolist(),
+        "value": np.where(np.isnan(lr), None, lr).tolist(),
+    }
+
+def _validator_series(points: dict) -> dict:
+    """Dashboard shape of _validator_points output"""
+    return {
+        "peers": {"epoch": points["epoch"], "count": points["count"]},
+        "learning_rate": {"epoch": points["epoch"], "value": points["value"]},
+    }
+
+def _merge_series(df: pd.DataFrame, key: str, columns: tuple, combine, series: dict, points) -> int:
+    """
+    Merge delta rows into `series` (key -> per-epoch columns plus its cached
+    output lists under "out"). Only keys in the delta are touched, and their
+    output is rebuilt from the first changed epoch on; output lists are
+    replaced rather than extended, so snapshots already handed out never change.
+    """
+    for name, epochs, values in _grouped_epochs(df, key, columns, combine):
+        entry = series.setdefault(name, {})
+        first = _merge_epochs(entry, epochs, values, combine)
+        suffix = points(entry, first)
+        out = entry.get("out")
+        if out is None:
+            entry["out"] = suffix
+        else:
+            kept = bisect.bisect_left(out["epoch"], int(entry["epoch"][first]))
+            entry["out"] = {field: out[field][:kept] + suffix[field] for field in out}
+    return len(df)
+
+class IncrementalDashboardCollector:
+    """
+    Stateful collector that keeps the dashboard series in memory.
+
+    The first cycle backfills the full window of each measurement. After that
+    every measurement only queries [high_water, now - lag), where high_water is
+    the (exclusive) stop of its previous window, and the delta is merged into
+    the snapshot, kept per miner / validator as epoch-sorted numpy columns:
+    - training_metrics: per (miner, epoch) sum/count, so means merge exactly
+    - allreduce_operations: per (validator, epoch, field) max
+    Each series also caches its output lists, and a merge only rebuilds them
+    from the first epoch the delta touched, so a cycle costs the size of the
+    delta rather than the length of the run.
+    The global loss series is append-only and kept by GlobalLossSeries.
+    A full resync is forced every `full_resync_every` cycles and whenever the
+    run_id changes, so points written late (older than the lag) self-heal. A
+    resync backfills into a fresh buffer that replaces the served series only
+    once its query succeeded, so a failed or slow backfill keeps the previous
+    snapshot on the dashboard instead of an empty one.
+
+    Measurements are updated independently (and concurrently): queries run
+    outside the lock, only the merge and the snapshot reads take it. A
+    measurement whose previous query is still in flight is skipped, and a
+    query that straddles a reset is discarded instead of merged.
+    """
+
+    MEASUREMENTS = ("training_metrics", "allreduce_operations")
+
+    def __init__(
+        self,
+        miner_days: int = 30,
+        validator_days: int = 30,
+        lag_seconds: int = 5,
+        full_resync_every: int = 120,
+    ):
+        self.days = {
+            "training_metrics": miner_days,
+            "allreduce_operations": validator_days,
+        }
+        self.lag = timedelta(seconds=lag_seconds)
+        self.full_resync_every = full_resync_every
+        self.cycles = 0
+        self._lock = threading.RLock()
+        self._inflight = set()
+        self._generation = 0
+        self.high_water = {}  # measurement -> exclusive stop of the last merged window
+        self.last_epoch = {}  # measurement -> newest epoch merged so far
+        self._series = {
+            # uid -> {"epoch": array, <column>: array, "out": {<output list>: [...]}}
+            "training_metrics": {},  # columns sum, count
+            "allreduce_operations": {},  # columns participating_miners, failed_miners, learning_rate
+        }
+        self.reset(None)
+
+    def reset(self, run_id):
+        """Schedule a backfill of every measurement; the current snapshot is served until each one lands"""
+        with self._lock:
+            self._generation += 1
+            self.run_id = run_id
+            self._resync = set(self.MEASUREMENTS)  # measurements whose next update backfills
+
+    def start_cycle(self, run_id) -> str:
+        """Count a collection cycle and reset when the run changed or a resync is due"""
+        run_id = str(run_id)
+        with self._lock:
+            self.cycles += 1
+            if run_id != self.run_id or (self.full_resync_every and self.cycles % self.full_resync_every == 0):
+                print(f"Incremental collector: full backfill for run_id {run_id}")
+                self.reset(run_id)
+        return run_id
+
+    def _window(self, measurement: str, backfill: bool) -> tuple[str, datetime]:
+        """Return (flux start, stop) for the next query of `measurement`"""
+        stop = datetime.now(timezone.utc) - self.lag
+        last_seen = None if backfill else self.high_water.get(measurement)
+        start = _flux_time(last_seen) if last_seen is not None else f"-{self.days[measurement]}d"
+        return start, stop
+
+    def update_source(self, measurement: str, run_id: str):
+        """Query and merge the delta of one measurement. Returns merged rows, or None if skipped."""
+        fetch, merge = {
+            "training_metrics": (self._fetch_miners, self._merge_miners),
+            "allreduce_operations": (self._fetch_validators, self._merge_validators),
+        }[measurement]
+
+        with self._lock:
+            if measurement in self._inflight:
+                print(f"Incremental collector: previous {measurement} query still running, skipping")
+                return None
+            self._inflight.add(measurement)
+            generation = self._generation
+            backfill = measurement in self._resync
+            start, stop = self._window(measurement, backfill)
+
+        try:
+            delta = fetch(run_id, start, stop)
+            with self._lock:
+                if generation != self._generation:
+                    return None
+                if backfill:
+                    # Swap the rebuilt series in only now that the backfill succeeded
+                    series = {}
+                    rows, epochs = merge(delta, series)
+                    self._series[measurement] = series
+                    self.last_epoch.pop(measurement, None)
+                    self._resync.discard(measurement)
+                else:
+                    rows, epochs = merge(delta, self._series[measurement])
+                self.high_water[measurement] = stop
+                if len(epochs):
+                    self.last_epoch[measurement] = max(self.last_epoch.get(measurement, -1), int(max(epochs)))
+            print(f"Incremental collector: merged {rows} {measurement} rows (last epoch: {self.last_epoch.get(measurement)})")
+            return rows
+        finally:
+            with self._lock:
+                self._inflight.discard(measurement)
+
+    def _fetch_miners(self, run_id: str, start: str, stop: datetime) -> pd.DataFrame:
+        flux = f'''
+        from(bucket: "mechanism-0")
+            |> range(start: {start}, stop: {_flux_time(stop)})
+            |> filter(fn: (r) => r._measurement == "training_metrics")
+            |> filter(fn: (r) => r._field == "loss")
+            |> filter(fn: (r) => r["run_id"] == "{run_id}")
+            |> group(columns: ["miner_uid", "epoch", "run_id"])
+            |> reduce(
+                fn: (r, accumulator) => ({{sum: accumulator.sum + float(v: r._value), count: accumulator.count + 1}}),
+                identity: {{sum: 0.0, count: 0}}
+            )
+            |> map(fn: (r) => ({{miner_uid: r.miner_uid, epoch: int(v: r.epoch), sum: r.sum, count: r.count}}))
+            |> group()
+            |> sort(columns: ["miner_uid", "epoch"])
+        '''
+        # One table of four columns in (miner, epoch) order. The positive-loss
+        # filter stays client-side: a window only holds partial sums of an epoch.
+        return _to_frame(initialize_influx_client().query_api().query_data_frame(flux))
+
+    @staticmethod
+    def _merge_miners(df: pd.DataFrame, miners: dict):
+        if df.empty:
+            return 0, ()
+        df = df[["miner_uid", "epoch", "sum", "count"]].dropna()
+        df = df.assign(epoch=df["epoch"].astype(np.int64))
+        return _merge_series(df, "miner_uid", ("sum", "count"), np.add, miners, _miner_points), df["epoch"]
+
+    def _fetch_validators(self, run_id: str, start: str, stop: datetime) -> pd.DataFrame:
+        flux = f'''
+        from(bucket: "mechanism-0")
+            |> range(start: {start}, stop: {_flux_time(stop)})
+            |> filter(fn: (r) => r._measurement == "allreduce_operations")
+            |> filter(fn: (r) => exists r.epoch and exists r.validator_uid and exists r._value)
+            |> filter(fn: (r) => r["run_id"] == "{run_id}")
+            |> drop(columns: ["_start", "_stop"])
+            |> group(columns: ["validator_uid", "epoch", "run_id", "_field"])
+            |> max()
+            |> pivot(rowKey: ["epoch", "validator_uid"], columnKey: ["_field"], valueColumn: "_value")
+        '''
+        return _to_frame(initialize_influx_client().query_api().query_data_frame(flux))
+
+    @staticmethod
+    def _merge_validators(df: pd.DataFrame, validators: dict):
+        if df.empty or not any(c in df.columns for c in VALIDATOR_FIELDS):
+            return 0, ()
+        df = df.assign(epoch=df["epoch"].astype(np.int64))
+        return _merge_series(df, "validator_uid", VALIDATOR_FIELDS, np.fmax, validators, _validator_points), df["epoch"]
+
+    def miner_data(self) -> dict:
+        """Same shape as get_miner_influx_data (the cached lists are shared: don't modify them)"""
+        with self._lock:
+            miners = self._series["training_metrics"]
+            outs = [(uid, miners[uid]["out"]) for uid in sorted(miners)]
+        return {uid: out for uid, out in outs if out["epoch"]}
+
+    def validator_data(self, epoch: int) -> dict:
+        """Same shape as get_validator_influx_data, limited to epochs <= `epoch`"""
+        with self._lock:
+            validators = self._series["allreduce_operations"]
+            outs = [(uid, validators[uid]["out"]) for uid in sorted(validators)]
+        validators_dict = {}
+        for uid, out in outs:
+            if epoch is not None and out["epoch"] and out["epoch"][-1] > epoch:
+                end = bisect.bisect_right(out["epoch"], epoch)
+                out = {field: values[:end] for field, values in out.items()}
+            if out["epoch"]:
+                validators_dict[uid] = _validator_series(out)
+        return validators_dict
+
+_collector = IncrementalDashboardCollector()
 
 def preview_dict(d: dict, max_items: int = 3) -> dict:
     """
@@ -344,12 +797,34 @@ def preview_dict(d: dict, max_items: int = 3) -> dict:
             preview[k] = v
     return preview
 
-def generate_dashboard_data(save_json: bool = True) -> dict:
+def generate_dashboard_data(
+    save_json: bool = True,
+    incremental: bool = True,
+    miner_points: int = None,
+    miner_downsample: str = None,
+) -> dict:
     """
     Combine miner/validator graph data with losses data into one dictionary.
     If run_id is None, fetch the latest run_id dynamically.
     Verbose controls printing. save_json controls saving to dashboard_data.json.
+    incremental merges only new rows into the module-level snapshot instead of
+    re-querying the full history (see IncrementalDashboardCollector).
+    miner_points caps every miner loss series at that many points using
+    miner_downsample ("lttb" or "minmax"); defaults to MINER_LOSS_MAX_POINTS
+    and MINER_LOSS_DOWNSAMPLE from .env, 0 keeps every epoch.
     """
+    if miner_points is None:
+        miner_points = int(os.getenv("MINER_LOSS_MAX_POINTS", "0"))
+    miner_downsample = miner_downsample or os.getenv("MINER_LOSS_DOWNSAMPLE", "lttb")
+    if miner_points < 0:
+        print(f"Warning: miner_points={miner_points} is negative, keeping every epoch")
+        miner_points = 0
+    if miner_downsample not in DOWNSAMPLE_METHODS:
+        print(f"Warning: unknown miner_downsample {miner_downsample!r}, using lttb")
+        miner_downsample = "lttb"
+
+    # Served from the background metagraph snapshot; only the first cycle waits for a sync
+    active_miners_future = _executor.submit(get_active_miners_bt_metagraph)
 
     run_id, latest_epoch = get_latest_run_and_epoch_validator_influx()
     run_id = 5
@@ -358,7 +833,45 @@ def generate_dashboard_data(save_json: bool = True) -> dict:
     print(f"run_id: {run_id}")
     print(f"latest_epoch: {latest_epoch}")
 
-    global_loss_data = get_global_model_loss_influx(run_id)
+    # Fan out the independent fetches; the cycle takes as long as the slowest one
+    if incremental:
+        collector_run_id = _collector.start_cycle(run_id)
+        futures = {
+            measurement: _executor.submit(_collector.update_source, measurement, collector_run_id)
+            for measurement in _collector.MEASUREMENTS
+        }
+    else:
+        futures = {
+            "validators": _executor.submit(get_validator_influx_data, run_id, epoch=latest_epoch),
+            "miners": _executor.submit(get_miner_influx_data, run_id, epoch=latest_epoch),
+        }
+    # Append-only in both modes: only the first call per run backfills
+    futures["global_loss"] = _executor.submit(get_global_model_loss_influx, run_id)
+    futures["active_miners"] = active_miners_future
+
+    results, stale_sources = _collect(futures, defaults={
+        "global_loss": {"outer_steps": [], "losses": []},
+        "validators": {},
+        "miners": {},
+        "active_miners": 0,
+    })
+    metagraph_status = _metagraph.status()
+    if metagraph_status["stale"] and "active_miners" not in stale_sources:
+        stale_sources.append("active_miners")
+    if stale_sources:
+        print(f"Stale sources this cycle: {stale_sources}")
+
+    # Copy so padding never touches the cached last good value
+    global_loss_data = {k: list(v) for k, v in results["global_loss"].items()}
+    if incremental:
+        validator_data = _collector.validator_data(latest_epoch)
+        miner_data = _collector.miner_data()
+    else:
+        validator_data = results["validators"]
+        miner_data = results["miners"]
+
+    if miner_points:
+        miner_data = downsample_miners(miner_data, miner_points, miner_downsample)
 
     if global_loss_data.get("outer_steps") and latest_epoch is not None:
         steps = global_loss_data["outer_steps"]
@@ -373,13 +886,10 @@ def generate_dashboard_data(save_json: bool = True) -> dict:
 
     print(f"global_loss_data preview: {preview_dict(global_loss_data)}")
 
-    active_miners_count = get_active_miners_bt_metagraph()
+    active_miners_count = results["active_miners"]
     print(f"Active miners count: {active_miners_count}")
 
-    validator_data = get_validator_influx_data(run_id, epoch=latest_epoch)
     print(f"validator_data preview: {preview_dict(validator_data)}")
-
-    miner_data = get_miner_influx_data(run_id, epoch=latest_epoch)
     print(f"miner_data preview: {preview_dict(miner_data)}")
 
     dashboard_dict = {
@@ -388,7 +898,9 @@ def generate_dashboard_data(save_json: bool = True) -> dict:
         "validators": validator_data,
         "global_loss_data": global_loss_data,
         "active_miners": active_miners_count,
-        "model_size": "1.1B"
+        "metagraph": metagraph_status,
+        "model_size": "1.1B",
+        "stale_sources": stale_sources,
     }
 
     if save_json:
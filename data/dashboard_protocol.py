@@ -0,0 +1,169 @@
+"""
+Versioned snapshot/patch protocol for the dashboard WebSocket.
+
+Clients that connect with `?protocol=2` receive
+
+    {"type": "snapshot", "channel": c, "version": v, "data": {...view...}}
+
+on connect (or subscribe), and after that only
+
+    {"type": "patch", "channel": c, "version": v, "base": v - 1, "data": {...patch...}}
+
+whenever that view changed. A client whose version != base sends
+{"type": "resync", "channel": c} and gets a fresh snapshot.
+
+Patch nodes (see diff_snapshot / applyPatch in src/services/dashboardSocket.js):
+- {"$set": value}                  replace the value
+- {"$at": k, "<key>": [...], ...}  series (dict of lists): truncate every list
+                                   to k items, then append the given items
+- {"<key>": node, "$removed": [..]} nested dict: patch / delete children
+Dashboard series are append-only (new epochs, new outer steps), with at
+most the last points revised, so a patch is a few items per miner instead
+of every miner's full history.
+
+Channels: a connection can multiplex several named views of the dashboard
+dict ({"type": "subscribe" | "unsubscribe", "channels": [...]}). Every
+snapshot/patch/resync message carries its "channel" and each channel has its
+own version sequence. The "*" channel is the whole dict, which is what a
+protocol-2 client gets when it does not pass `channels` in the connect URL.
+Each channel's view is a subset of the full dict, so a client deep-merges
+its channels back into the familiar shape.
+
+Downsampled miners: "miners:<points>" or "miners:<points>:<method>" (lttb,
+the default, or minmax; see downsample.py) is the miners channel with every
+loss series reduced to at most <points> points. <points> must be one of
+DOWNSAMPLE_POINTS: each distinct channel is downsampled on every change, so
+the set of them is kept small.
+"""
+
+from downsample import DOWNSAMPLE_METHODS, downsample_miners
+
+PROTOCOL_VERSION = 2
+
+# Allowed <points> of downsampled channels
+DOWNSAMPLE_POINTS = (250, 500, 1000, 2000, 5000)
+
+# Small top-level keys every channel carries
+META_KEYS = ("run_id", "model_size", "stale_sources")
+
+
+def _with_meta(data: dict, view: dict) -> dict:
+    view.update({key: data[key] for key in META_KEYS if key in data})
+    return view
+
+
+def _validator_part(data: dict, part: str) -> dict:
+    return {uid: {part: v[part]} for uid, v in data.get("validators", {}).items() if part in v}
+
+
+CHANNELS = {
+    "*": lambda data: data,
+    "global_loss": lambda data: _with_meta(data, {"global_loss_data": data.get("global_loss_data", {})}),
+    "validators.peers": lambda data: _with_meta(data, {"validators": _validator_part(data, "peers")}),
+    "validators.learning_rate": lambda data: _with_meta(data, {"validators": _validator_part(data, "learning_rate")}),
+    "miners": lambda data: _with_meta(data, {"miners": data.get("miners", {})}),
+    "active_miners": lambda data: _with_meta(data, {"active_miners": data.get("active_miners"), "metagraph": data.get("metagraph")}),
+}
+
+# Fields that change on every refresh without changing what a viewer sees; they
+# are left out of change detection and go out with the next real change
+VOLATILE_FIELDS = {
+    "metagraph": ("block", "synced_at"),
+}
+
+# Top-level sections each channel is built from (None: all of them). The meta
+# keys count for every channel; used to skip channels whose sections are unchanged.
+CHANNEL_SECTIONS = {
+    "*": None,
+    "global_loss": ("global_loss_data",),
+    "validators.peers": ("validators",),
+    "validators.learning_rate": ("validators",),
+    "miners": ("miners",),
+    "active_miners": ("active_miners", "metagraph"),
+}
+
+
+def resolve_channel(name: str):
+    """Selector for channel `name`, or None if it is not a valid channel"""
+    if name in CHANNELS:
+        return CHANNELS[name]
+    base, _, spec = name.partition(":")
+    points, _, method = spec.partition(":")
+    method = method or "lttb"
+    if base != "miners" or not points.isdigit() or method not in DOWNSAMPLE_METHODS:
+        return None
+    points = int(points)
+    if points not in DOWNSAMPLE_POINTS:
+        return None
+    return lambda data: _with_meta(data, {"miners": downsample_miners(data.get("miners", {}), points, method)})
+
+
+def channel_changed(name: str, changed_sections: set) -> bool:
+    """Whether channel `name` depends on any of `changed_sections`"""
+    sections = CHANNEL_SECTIONS[name.partition(":")[0]]
+    if sections is None:
+        return bool(changed_sections)
+    return any(key in changed_sections for key in sections + META_KEYS)
+
+
+_NO_CHANGE = object()
+
+
+def _is_series(value) -> bool:
+    return isinstance(value, dict) and bool(value) and all(isinstance(v, list) for v in value.values())
+
+
+def _common_prefix(old: list, new: list) -> int:
+    n = min(len(old), len(new))
+    for i in range(n):
+        if old[i] != new[i]:
+            return i
+    return n
+
+
+def _diff(old, new):
+    if _is_series(new) and _is_series(old) and old.keys() == new.keys():
+        at = min(_common_prefix(old[k], new[k]) for k in new)
+        if all(len(old[k]) == len(new[k]) == at for k in new):
+            return _NO_CHANGE
+        node = {"$at": at}
+        node.update({k: new[k][at:] for k in new})
+        return node
+
+    if isinstance(new, dict) and isinstance(old, dict) and not _is_series(new) and not _is_series(old):
+        node = {}
+        for key, value in new.items():
+            child = _diff(old[key], value) if key in old else {"$set": value}
+            if child is not _NO_CHANGE:
+                node[key] = child
+        removed = [key for key in old if key not in new]
+        if removed:
+            node["$removed"] = removed
+        return node or _NO_CHANGE
+
+    return _NO_CHANGE if old == new else {"$set": new}
+
+
+def diff_snapshot(old: dict, new: dict):
+    """Return the patch turning `old` into `new`, or None if nothing changed"""
+    if old is None:
+        return {"$set": new}
+    patch = _diff(old, new)
+    return None if patch is _NO_CHANGE else patch
+
+
+def apply_patch(target, patch):
+    """Python mirror of the frontend applyPatch (used for debugging / verification)"""
+    if "$set" in patch:
+        return patch["$set"]
+    if "$at" in patch:
+        at = patch["$at"]
+        target = target or {}
+        return {k: list(target.get(k, []))[:at] + v for k, v in patch.items() if k != "$at"}
+    out = dict(target or {})
+    for key in patch.get("$removed", []):
+        out.pop(key, None)
+    for key, child in patch.items():
+        if key != "$removed":
+            out[key] = apply_patch(out.get(key), child)
+    return out
@@ -0,0 +1,161 @@
+"""
+Micro-benchmark: per-request serialization of /api/mech1/strategies rows.
+
+Compares the previous iterrows() + safe_* loops for miner and benchmark rows
+with strategy_records.miner_records / benchmark_records on synthetic frames.
+
+Run from data/:  python debug/bench_strategy_records.py [rows ...]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from strategy_records import miner_records, benchmark_records
+
+
+def safe_int(val):
+    if val is None or pd.isna(val):
+        return None
+    try:
+        return int(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def safe_float(val):
+    if val is None or pd.isna(val):
+        return None
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def safe_str(val):
+    if val is None or pd.isna(val):
+        return ''
+    return str(val)
+
+
+def shorten_hotkey(value, prefix=8, suffix=4):
+    if value is None:
+        return ""
+    s = str(value)
+    if len(s) <= prefix + suffix + 3:
+        return s
+    return f"{s[:prefix]}...{s[-suffix:]}"
+
+
+def legacy_miners(df, filename_of):
+    """The miner loop as it was in build_strategies"""
+    out = []
+    for _, row in df.iterrows():
+        gist_url = safe_str(row.get('gist_url', ''))
+        out.append({
+            "uid": safe_int(row.get('uid')),
+            "hotkey": safe_str(row.get('hotkey', '')),
+            "hotkey_short": shorten_hotkey(safe_str(row.get('hotkey', ''))),
+            "score": safe_float(row.get('score', 0)) or 0.0,
+            "loss": safe_float(row.get('loss')),
+            "communication": safe_int(row.get('communication')),
+            "throughput": safe_int(row.get('throughput')),
+            "gist_url": gist_url,
+            "filename": filename_of(gist_url),
+            "last_update": safe_str(row.get('last_update', '')),
+            "time": safe_str(row.get('_time', '')),
+            "is_benchmark": False
+        })
+    return out
+
+
+def legacy_benchmarks(df):
+    """The benchmark loop as it was in load_benchmark_entries"""
+    out = []
+    for _, row in df.iterrows():
+        gist_url = safe_str(row.get('gist_url', ''))
+        hotkey = safe_str(row.get('hotkey', ''))
+        if hotkey.startswith('benchmark_'):
+            name = hotkey.replace('benchmark_', '').replace('_', ' ').title()
+        else:
+            name = gist_url if gist_url.startswith('benchmark_') else 'Benchmark'
+        last_update_raw = safe_str(row.get('last_update', ''))
+        try:
+            if last_update_raw:
+                dt = datetime.fromisoformat(last_update_raw.replace('Z', '+00:00'))
+                last_update_formatted = dt.strftime('%Y-%m-%d %H:%M')
+            else:
+                last_update_formatted = ''
+        except ValueError:
+            last_update_formatted = last_update_raw[:16] if len(last_update_raw) > 16 else last_update_raw
+        out.append({
+            "uid": None,
+            "hotkey": hotkey,
+            "hotkey_short": name,
+            "score": safe_float(row.get('score', 0)) or 0.0,
+            "loss": safe_float(row.get('loss')),
+            "communication": safe_int(row.get('communication')),
+            "throughput": safe_int(row.get('throughput')),
+            "gist_url": gist_url,
+            "filename": name,
+            "last_update": last_update_formatted,
+            "time": "",
+            "is_benchmark": True
+        })
+    return out
+
+
+def synthetic_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Filtered hotkey_scores rows as build_strategies sees them (with gaps)"""
+    rng = np.random.default_rng(seed)
+    missing = lambda p: rng.random(rows) < p
+    loss = rng.uniform(2, 8, rows)
+    loss[missing(0.1)] = np.nan
+    communication = rng.integers(0, 10**9, rows).astype(float)
+    communication[missing(0.1)] = np.nan
+    stamps = pd.Timestamp("2025-01-01", tz="UTC") + pd.to_timedelta(rng.integers(0, 10**7, rows), unit="s")
+    hotkeys = np.array([f"5{i:047d}" for i in range(rows)], dtype=object)
+    hotkeys[: rows // 10] = [f"benchmark_model_{i}" for i in range(rows // 10)]
+    return pd.DataFrame({
+        "uid": np.arange(rows),
+        "hotkey": hotkeys,
+        "score": np.where(missing(0.05), np.nan, rng.random(rows)),
+        "loss": loss,
+        "communication": communication,
+        "throughput": rng.integers(0, 10**6, rows),
+        "gist_url": [f"https://gist.github.com/user/{i % 500:032x}" for i in range(rows)],
+        "last_update": stamps.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        "_time": stamps.strftime("%Y-%m-%d %H:%M"),
+    })
+
+
+def timed(fn, *args, repeat: int = 3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000, 10_000]
+    filename_of = lambda url: url.rsplit("/", 1)[-1][:8] + ".py"
+
+    for rows in sizes:
+        df = synthetic_frame(rows)
+        print(f"{rows:,} strategies")
+        for label, legacy, vectorized, args in [
+            ("miners", legacy_miners, miner_records, (df, filename_of)),
+            ("benchmarks", legacy_benchmarks, benchmark_records, (df,)),
+        ]:
+            legacy_s, expected = timed(legacy, *args, repeat=1)
+            vectorized_s, actual = timed(vectorized, *args)
+            assert expected == actual, f"{label}: outputs differ"
+            print(f"  {label:<10} iterrows: {legacy_s * 1000:8.1f} ms   columnar: {vectorized_s * 1000:7.1f} ms"
+                  f"  ({legacy_s / vectorized_s:.1f}x faster)")
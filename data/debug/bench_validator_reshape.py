@@ -0,0 +1,102 @@
+"""
+Micro-benchmark: per-validator reshape of the allreduce rows.
+
+Compares the previous groupby / per-group sort_values reshape with
+validators_from_frame, and times the path production takes by default:
+IncrementalDashboardCollector backfilling the same rows, then a steady-state
+cycle (one new epoch merged + validator_data), on synthetic pivoted rows.
+
+Run from data/:  python debug/bench_validator_reshape.py [validators] [epochs]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from dashboard_data_collector import IncrementalDashboardCollector, validators_from_frame
+
+
+def legacy_reshape(df_allreduce: pd.DataFrame) -> dict:
+    """The reshape as it was before validators_from_frame"""
+    df_allreduce = df_allreduce.copy()
+    df_allreduce["participating_miners"] = df_allreduce["participating_miners"].round().astype(int)
+    df_allreduce["succesful_miners"] = df_allreduce["participating_miners"] - df_allreduce["failed_miners"].fillna(0).astype(int)
+    df_allreduce["epoch"] = df_allreduce["epoch"].astype(int)
+    return {
+        str(validator_uid): {
+            "peers": {
+                "epoch": group.sort_values("epoch")["epoch"].tolist(),
+                "count": group.sort_values("epoch")["succesful_miners"].tolist()
+            },
+            "learning_rate": {
+                "epoch": group.sort_values("epoch")["epoch"].tolist(),
+                "value": [
+                    None if (isinstance(v, float) and np.isnan(v)) else v
+                    for v in group.sort_values("epoch")["learning_rate"].tolist()
+                ]
+            }
+        }
+        for validator_uid, group in df_allreduce.groupby("validator_uid")
+    }
+
+
+def synthetic_frame(validators: int, epochs: int, seed: int = 0) -> pd.DataFrame:
+    """Pivoted allreduce rows in the shape query_data_frame returns (epoch is a string tag)"""
+    rng = np.random.default_rng(seed)
+    rows = validators * epochs
+    learning_rate = rng.uniform(1e-5, 1e-3, rows)
+    learning_rate[rng.random(rows) < 0.05] = np.nan
+    df = pd.DataFrame({
+        "validator_uid": np.repeat(np.arange(validators), epochs).astype(str),
+        "epoch": np.tile(np.arange(epochs), validators).astype(str),
+        "participating_miners": rng.uniform(0, 256, rows),
+        "failed_miners": np.where(rng.random(rows) < 0.1, np.nan, rng.integers(0, 8, rows)),
+        "learning_rate": learning_rate,
+    })
+    # Influx returns rows sorted by epoch, not by validator
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def timed(fn, df: pd.DataFrame, repeat: int) -> tuple[float, dict]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(df)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+if __name__ == "__main__":
+    validators = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    epochs = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+
+    df = synthetic_frame(validators, epochs)
+    print(f"{validators} validators x {epochs} epochs = {len(df):,} rows")
+
+    legacy_s, legacy = timed(legacy_reshape, df, repeat=1)
+    vectorized_s, vectorized = timed(validators_from_frame, df, repeat=3)
+
+    collector = IncrementalDashboardCollector()
+    series = {}
+    started = time.perf_counter()
+    collector._merge_validators(df, series)
+    collector._series["allreduce_operations"] = series
+    backfilled = collector.validator_data(epochs)
+    backfill_s = time.perf_counter() - started
+
+    delta = synthetic_frame(validators, 1, seed=1).assign(epoch=str(epochs))
+    started = time.perf_counter()
+    collector._merge_validators(delta, series)
+    cycled = collector.validator_data(epochs)
+    cycle_s = time.perf_counter() - started
+
+    assert legacy == vectorized == backfilled, "outputs differ"
+    assert cycled == validators_from_frame(pd.concat([df, delta])), "incremental output differs"
+    print(f"legacy groupby reshape: {legacy_s * 1000:9.1f} ms")
+    print(f"validators_from_frame:  {vectorized_s * 1000:9.1f} ms  ({legacy_s / vectorized_s:.1f}x faster)")
+    print(f"collector backfill:     {backfill_s * 1000:9.1f} ms")
+    print(f"collector cycle:        {cycle_s * 1000:9.1f} ms  (one new epoch merged + validator_data)")
@@ -0,0 +1,112 @@
+"""
+Downsampling of per-miner loss histories.
+
+Both methods return the indices of the points to keep (always including the
+first and last point), so the original epoch/loss values and types survive:
+- lttb:   Largest-Triangle-Three-Buckets, keeps the visual shape of the curve
+- minmax: min and max of each bucket, keeps every spike
+
+Buckets are anchored on the x axis: bucket k holds x in [k * width, (k + 1) * width)
+with a power-of-two width, so as a series grows only its open tail bucket
+(and, for LTTB, the one before it) picks different points, and a patch of the
+downsampled series stays as small as one of the raw series. The width only
+changes when the x span doubles. Selection is vectorized over all buckets.
+"""
+
+import numpy as np
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def _buckets(x: np.ndarray, buckets: int):
+    """[start, end) of each anchored bucket over sorted `x`, for at most `buckets` buckets"""
+    span = float(x[-1] - x[0]) if len(x) else 0.0
+    # floor(x / width) takes at most span / width + 1 distinct values, which
+    # is `buckets` for buckets >= 2 (a single bucket can still come out as two)
+    width = 2.0 ** np.ceil(np.log2(max(span / max(buckets - 1, 1), 1.0)))
+    ids = np.floor(x / width).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.r_[starts[1:], len(x)]
+    return starts, ends
+
+
+def _argext_per_bucket(values: np.ndarray, starts: np.ndarray, ends: np.ndarray, reduce) -> np.ndarray:
+    """Index of the first max (reduce=np.maximum) or min (np.minimum) of every bucket"""
+    extremes = reduce.reduceat(values, starts)
+    bucket = np.repeat(np.arange(len(starts)), ends - starts)
+    hits = np.flatnonzero(values == extremes[bucket])
+    _, first = np.unique(bucket[hits], return_index=True)
+    return hits[first]
+
+
+def lttb_indices(x, y, points: int) -> np.ndarray:
+    """Indices of at most `points` points chosen by anchored-bucket LTTB"""
+    size = len(y)
+    if points >= size:
+        return np.arange(size)
+    if points < 4:
+        # LTTB needs at least two inner buckets to stay within the budget
+        return _evenly_spaced(size, points)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    inner_x, inner_y = x[1:-1], y[1:-1]
+    starts, ends = _buckets(inner_x, points - 2)
+    counts = ends - starts
+    mean_x = np.add.reduceat(inner_x, starts) / counts
+    mean_y = np.add.reduceat(inner_y, starts) / counts
+
+    # Triangle with the previous and next bucket averages (first/last point at the ends),
+    # so every bucket is independent of what was picked before it
+    prev_x, prev_y = np.r_[x[0], mean_x[:-1]], np.r_[y[0], mean_y[:-1]]
+    next_x, next_y = np.r_[mean_x[1:], x[-1]], np.r_[mean_y[1:], y[-1]]
+    ax, ay = np.repeat(prev_x, counts), np.repeat(prev_y, counts)
+    cx, cy = np.repeat(next_x, counts), np.repeat(next_y, counts)
+    area = np.abs((ax - cx) * (inner_y - ay) - (ax - inner_x) * (cy - ay))
+
+    picked = _argext_per_bucket(area, starts, ends, np.maximum) + 1
+    return np.r_[0, picked, size - 1]
+
+
+def minmax_indices(x, y, points: int) -> np.ndarray:
+    """Indices of the min and max of each anchored bucket (at most `points` points)"""
+    size = len(y)
+    if points >= size:
+        return np.arange(size)
+    if points < 6:
+        # Two points per bucket, and at least two buckets to stay within the budget
+        return _evenly_spaced(size, points)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    inner_y = y[1:-1]
+    starts, ends = _buckets(x[1:-1], (points - 2) // 2)
+    lows = _argext_per_bucket(inner_y, starts, ends, np.minimum) + 1
+    highs = _argext_per_bucket(inner_y, starts, ends, np.maximum) + 1
+    return np.unique(np.r_[0, lows, highs, size - 1])
+
+
+def _evenly_spaced(size: int, points: int) -> np.ndarray:
+    """Evenly spaced indices (first and last included) for tiny budgets, at most `points` of them"""
+    if points <= 0:
+        return np.arange(0)
+    return np.unique(np.linspace(0, size - 1, points).round().astype(int))
+
+
+def downsample_series(xs: list, ys: list, points: int, method: str = "lttb") -> tuple[list, list]:
+    """Return (xs, ys) reduced to at most `points` points"""
+    if not points or len(ys) <= points:
+        return xs, ys
+    indices = lttb_indices(xs, ys, points) if method == "lttb" else minmax_indices(xs, ys, points)
+    return [xs[i] for i in indices], [ys[i] for i in indices]
+
+
+def downsample_miners(miners: dict, points: int, method: str = "lttb") -> dict:
+    """Downsample every miner's {"epoch": [...], "loss": [...]} series"""
+    if not points:
+        return miners
+    out = {}
+    for uid, series in miners.items():
+        epochs, losses = downsample_series(series["epoch"], series["loss"], points, method)
+        out[uid] = {"epoch": epochs, "loss": losses}
+    return out
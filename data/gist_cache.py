@@ -0,0 +1,241 @@
+"""
+Persistent cache of GitHub gist metadata and code for the mech1 API.
+
+Entries live in a bounded in-memory LRU backed by one JSON file per gist on
+disk (pruned together with the LRU), so restarts don't go back to GitHub for
+every strategy. Stale entries
+are revalidated with ETag conditional requests (a 304 is cheap and does not
+count against the rate limit), and failures are cached too: missing gists
+for a long while, rate limits / errors until GitHub says to retry, during
+which the last good entry (if any) keeps being served.
+"""
+
+import os
+import re
+import json
+import time
+import queue
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import requests
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".gist_cache")
+GITHUB_API = "https://api.github.com/gists"
+
+# Gist ids are hex strings; anything else is never looked up, fetched or written
+GIST_ID = re.compile(r"[0-9a-fA-F]{10,64}")
+
+
+def valid_gist_id(gist_id) -> bool:
+    return isinstance(gist_id, str) and GIST_ID.fullmatch(gist_id) is not None
+
+
+class GistCache:
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_entries: int = 512,
+        ttl: float = 600,
+        missing_ttl: float = 3600,
+        error_ttl: float = 60,
+        token: str = "",
+        pool_size: int = 16,
+    ):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl = ttl  # revalidate good entries after this many seconds
+        self.missing_ttl = missing_ttl  # 404s
+        self.error_ttl = error_ttl  # timeouts / 5xx / rate limits without a reset time
+        self.token = token
+        self._entries = OrderedDict()  # gist_id -> entry, least recently used first
+        self._lock = threading.Lock()
+        self._fetch_locks = {}  # gist_id -> [lock, threads using it], only while fetching
+        self.session = requests.Session()
+        self.session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=pool_size))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._prune()
+
+    # ------------------------------
+    # Storage
+    # ------------------------------
+    def _path(self, gist_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{gist_id}.json")
+
+    def _remove(self, gist_ids):
+        for gist_id in gist_ids:
+            try:
+                os.remove(self._path(gist_id))
+            except OSError:
+                pass
+
+    def _prune(self):
+        """Keep only the max_entries most recently written files from earlier runs"""
+        try:
+            names = [n for n in os.listdir(self.cache_dir) if n.endswith(".json")]
+        except OSError:
+            return
+        paths = sorted((os.path.join(self.cache_dir, n) for n in names), key=os.path.getmtime, reverse=True)
+        self._remove(os.path.basename(p)[:-len(".json")] for p in paths[self.max_entries:])
+
+    def _remember(self, gist_id: str, entry: dict):
+        evicted = []
+        with self._lock:
+            self._entries[gist_id] = entry
+            self._entries.move_to_end(gist_id)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+        # The disk copy goes with the LRU entry, so the directory stays bounded too
+        self._remove(evicted)
+
+    def _save(self, gist_id: str, entry: dict):
+        self._remember(gist_id, entry)
+        try:
+            tmp = self._path(gist_id) + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._path(gist_id))
+        except OSError as e:
+            print(f"Could not write gist cache for {gist_id}: {e}")
+
+    def lookup(self, gist_id: str) -> Optional[dict]:
+        """Cached entry from memory or disk, without touching GitHub (may be stale)"""
+        if not valid_gist_id(gist_id):
+            return None
+        with self._lock:
+            entry = self._entries.get(gist_id)
+            if entry is not None:
+                self._entries.move_to_end(gist_id)
+                return entry
+        try:
+            with open(self._path(gist_id)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._remember(gist_id, entry)
+        return entry
+
+    # ------------------------------
+    # GitHub
+    # ------------------------------
+    def _fresh(self, entry: Optional[dict]) -> bool:
+        return entry is not None and time.time() < entry.get("retry_after", 0)
+
+    def _fetch(self, gist_id: str, cached: Optional[dict]) -> dict:
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"token {self.token}"
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+
+        now = time.time()
+        try:
+            response = self.session.get(f"{GITHUB_API}/{gist_id}", headers=headers, timeout=5)
+        except requests.RequestException as e:
+            print(f"GitHub API error for {gist_id}: {e}")
+            return self._failed(cached, "error", now + self.error_ttl)
+
+        if response.status_code == 304 and cached:
+            return {**cached, "checked_at": now, "retry_after": now + self.ttl}
+
+        if response.status_code == 200:
+            data = response.json()
+            files = list(data.get("files", {}).values())
+            if not files:
+                return self._failed(None, "missing", now + self.missing_ttl)
+            first_file = files[0]
+            history = data.get("history") or [{}]
+            return {
+                "status": "ok",
+                "gist_id": gist_id,
+                "revision": history[0].get("version"),
+                "etag": response.headers.get("ETag"),
+                "filename": first_file.get("filename"),
+                "content": first_file.get("content"),
+                "checked_at": now,
+                "retry_after": now + self.ttl,
+            }
+
+        if response.status_code == 404:
+            return self._failed(None, "missing", now + self.missing_ttl)
+
+        if response.status_code in (403, 429):
+            print("GitHub API rate limited. Consider setting GITHUB_TOKEN env var.")
+            reset = response.headers.get("X-RateLimit-Reset")
+            retry = response.headers.get("Retry-After")
+            until = float(reset) if reset else now + float(retry) if retry else now + self.error_ttl
+            return self._failed(cached, "rate_limited", until)
+
+        return self._failed(cached, "error", now + self.error_ttl)
+
+    @staticmethod
+    def _failed(cached: Optional[dict], status: str, retry_after: float) -> dict:
+        """Negative entry; keeps serving the last good content when there is one"""
+        if cached and cached.get("status") == "ok":
+            return {**cached, "retry_after": retry_after}
+        return {"status": status, "retry_after": retry_after}
+
+    def get(self, gist_id: str) -> dict:
+        """Entry for `gist_id`, revalidated against GitHub if it is stale (blocking)"""
+        if not valid_gist_id(gist_id):
+            return {"status": "missing", "retry_after": float("inf")}
+        cached = self.lookup(gist_id)
+        if self._fresh(cached):
+            return cached
+        with self._lock:
+            slot = self._fetch_locks.setdefault(gist_id, [threading.Lock(), 0])
+            slot[1] += 1
+        try:
+            with slot[0]:
+                # Another thread may have refreshed it meanwhile
+                cached = self.lookup(gist_id)
+                if self._fresh(cached):
+                    return cached
+                entry = self._fetch(gist_id, cached)
+                self._save(gist_id, entry)
+            return entry
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if not slot[1]:
+                    del self._fetch_locks[gist_id]
+
+    def stale(self, gist_id: str) -> bool:
+        """True if `gist_id` has no entry yet or is due for revalidation (never for invalid ids)"""
+        return valid_gist_id(gist_id) and not self._fresh(self.lookup(gist_id))
+
+
+class GistPrefetcher:
+    """
+    Resolves gists on a few background threads so request handlers never wait
+    on GitHub: submit() queues the ids that are missing or stale (each at most
+    once until its fetch finishes) and handlers read whatever lookup() has.
+    """
+
+    def __init__(self, cache: GistCache, workers: int = 4):
+        self.cache = cache
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        for i in range(workers):
+            threading.Thread(target=self._run, name=f"gist-prefetch-{i}", daemon=True).start()
+
+    def submit(self, gist_ids):
+        for gist_id in gist_ids:
+            with self._lock:
+                if gist_id in self._pending or not self.cache.stale(gist_id):
+                    continue
+                self._pending.add(gist_id)
+            self._queue.put(gist_id)
+
+    def _run(self):
+        while True:
+            gist_id = self._queue.get()
+            try:
+                self.cache.get(gist_id)
+            except Exception as e:
+                print(f"Error prefetching gist {gist_id}: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(gist_id)
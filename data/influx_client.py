@@ -0,0 +1,102 @@
+"""
+Shared InfluxDB client layer for the dashboard data services.
+
+Every service (websocket collector, mech1 API, mech0/mech1 Dash servers)
+gets its clients from here so that HTTP connections are pooled and kept
+alive across queries, and timeouts / retries / pool size are tuned in one
+place through environment variables.
+"""
+
+import os
+import atexit
+import threading
+from typing import Optional
+
+from influxdb_client import InfluxDBClient
+from urllib3.util.retry import Retry
+
+# ------------------------------
+# Tuning (override via .env, read when the first client is built)
+# ------------------------------
+DEFAULT_TIMEOUT_MS = 30_000
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_RETRIES = 3
+DEFAULT_READ_RETRIES = 0
+DEFAULT_RETRY_BACKOFF = 0.5
+
+# Env var holding the token for each mechanism's bucket
+MECHANISM_TOKEN_ENV = {
+    0: "INFLUXDB_TOKEN_MECHANISM_0",
+    1: "INFLUXDB_TOKEN_MECHANISM_1",
+}
+
+_clients: dict = {}
+_clients_lock = threading.Lock()
+
+
+def _build_retry() -> Retry:
+    """Retry connection errors and transient server responses with exponential backoff.
+    Flux queries are POSTs, so POST has to be allowed explicitly. Read timeouts
+    are not retried: a hung query would otherwise hold its worker for
+    (retries + 1) x the client timeout."""
+    retries = int(os.getenv("INFLUX_RETRIES", DEFAULT_RETRIES))
+    return Retry(
+        total=retries,
+        connect=retries,
+        read=int(os.getenv("INFLUX_READ_RETRIES", DEFAULT_READ_RETRIES)),
+        backoff_factor=float(os.getenv("INFLUX_RETRY_BACKOFF", DEFAULT_RETRY_BACKOFF)),
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST"]),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+
+
+def get_influx_client(mechanism: int = 0, url: Optional[str] = None, timeout: Optional[int] = None) -> InfluxDBClient:
+    """
+    Return a pooled, keep-alive InfluxDBClient for the given mechanism.
+
+    Clients are created once per (mechanism, url, timeout) and reused for the
+    lifetime of the process, so callers asking for a longer or shorter
+    per-query timeout get their own pool instead of reconfiguring a shared one.
+    Environment variables are read lazily so services can load .env first.
+    """
+    url = url or os.getenv("INFLUXDB_URL")
+    timeout = timeout or int(os.getenv("INFLUX_TIMEOUT_MS", DEFAULT_TIMEOUT_MS))
+    key = (mechanism, url, timeout)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = InfluxDBClient(
+                url=url,
+                token=os.getenv(MECHANISM_TOKEN_ENV[mechanism]),
+                org=os.getenv("INFLUXDB_ORG"),
+                timeout=timeout,
+                enable_gzip=os.getenv("INFLUX_ENABLE_GZIP", "1") == "1",
+                connection_pool_maxsize=int(os.getenv("INFLUX_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)),
+                retries=_build_retry(),
+            )
+            _clients[key] = client
+    return client
+
+
+def get_query_api(mechanism: int = 0, url: Optional[str] = None, timeout: Optional[int] = None):
+    """Shortcut for get_influx_client(...).query_api()"""
+    return get_influx_client(mechanism, url=url, timeout=timeout).query_api()
+
+
+@atexit.register
+def close_all_clients():
+    """Close every pooled client (and its open connections)"""
+    with _clients_lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _clients.clear()
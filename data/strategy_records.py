@@ -0,0 +1,109 @@
+"""
+Columnar serialization of mech1 strategy rows.
+
+Each column of the filtered frame is converted to JSON-ready Python values in
+one vectorized pass (NaN -> None, numeric coercion, timestamp formatting) and
+the records are zipped together at the end, instead of iterrows() plus a
+safe_* call per cell.
+"""
+
+import numpy as np
+import pandas as pd
+
+# "2024-05-01T12:34..." / "2024-05-01 12:34..." -> "2024-05-01 12:34"
+ISO_MINUTE = r"^(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2})"
+
+
+def _column(df: pd.DataFrame, name: str, default=None) -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def int_values(df: pd.DataFrame, name: str) -> list:
+    """Column as Python ints (truncated), None where missing or non-numeric"""
+    numeric = pd.to_numeric(_column(df, name), errors="coerce")
+    ints = np.trunc(numeric.to_numpy(dtype=float, na_value=np.nan))
+    valid = np.isfinite(ints)
+    out = np.full(len(ints), None, dtype=object)
+    out[valid] = ints[valid].astype(np.int64).tolist()
+    return out.tolist()
+
+
+def float_values(df: pd.DataFrame, name: str, fill=None) -> list:
+    """Column as Python floats, `fill` where missing or non-numeric"""
+    numeric = pd.to_numeric(_column(df, name), errors="coerce").astype(float)
+    return numeric.astype(object).where(numeric.notna(), fill).tolist()
+
+
+def str_values(df: pd.DataFrame, name: str) -> list:
+    """Column as strings, '' where missing"""
+    column = _column(df, name).astype(object)
+    return column.where(column.notna(), "").astype(str).tolist()
+
+
+def minute_values(df: pd.DataFrame, name: str) -> list:
+    """ISO timestamps as 'YYYY-MM-DD HH:MM' in their own offset; anything else is cut to 16 chars"""
+    raw = pd.Series(str_values(df, name), index=df.index, dtype=object)
+    parts = raw.str.extract(ISO_MINUTE)
+    formatted = (parts[0] + " " + parts[1]).where(parts[0].notna(), raw.str.slice(0, 16))
+    return formatted.tolist()
+
+
+def short_hotkeys(hotkeys: list, prefix: int = 8, suffix: int = 4) -> list:
+    """Hotkeys shortened for display as prefix...suffix (short ones are kept whole)"""
+    column = pd.Series(hotkeys, dtype=object)
+    short = column.str.slice(0, prefix) + "..." + column.str.slice(-suffix)
+    return short.where(column.str.len() > prefix + suffix + 3, column).tolist()
+
+
+def records(columns: dict, size: int) -> list[dict]:
+    """Zip {key: values-or-constant} into `size` dicts; lists are per row, anything else is repeated"""
+    keys = list(columns)
+    values = [v if isinstance(v, list) else [v] * size for v in columns.values()]
+    return [dict(zip(keys, row)) for row in zip(*values)]
+
+
+def miner_records(df: pd.DataFrame, filename_of) -> list[dict]:
+    """Strategy records for miner rows; filename_of(gist_url) is called once per distinct URL"""
+    gist_urls = str_values(df, "gist_url")
+    filenames = {url: filename_of(url) for url in set(gist_urls)}
+    hotkeys = str_values(df, "hotkey")
+    return records({
+        "uid": int_values(df, "uid"),
+        "hotkey": hotkeys,
+        "hotkey_short": short_hotkeys(hotkeys),
+        "score": float_values(df, "score", fill=0.0),
+        "loss": float_values(df, "loss"),
+        "communication": int_values(df, "communication"),
+        "throughput": int_values(df, "throughput"),
+        "gist_url": gist_urls,
+        "filename": [filenames[url] for url in gist_urls],
+        "last_update": str_values(df, "last_update"),
+        "time": str_values(df, "_time"),
+        "is_benchmark": False,
+    }, len(df))
+
+
+def benchmark_records(df: pd.DataFrame) -> list[dict]:
+    """Strategy records for benchmark rows, named after their benchmark_ hotkey"""
+    gist_urls = pd.Series(str_values(df, "gist_url"), dtype=object)
+    hotkeys = pd.Series(str_values(df, "hotkey"), dtype=object)
+    # Create a readable name from the benchmark hotkey
+    from_hotkey = hotkeys.str.replace("benchmark_", "", regex=False).str.replace("_", " ", regex=False).str.title()
+    fallback = gist_urls.where(gist_urls.str.startswith("benchmark_"), "Benchmark")
+    names = from_hotkey.where(hotkeys.str.startswith("benchmark_"), fallback).tolist()
+    return records({
+        "uid": None,
+        "hotkey": hotkeys.tolist(),
+        "hotkey_short": names,
+        "score": float_values(df, "score", fill=0.0),
+        "loss": float_values(df, "loss"),
+        "communication": int_values(df, "communication"),
+        "throughput": int_values(df, "throughput"),
+        "gist_url": gist_urls.tolist(),
+        "filename": names,
+        "last_update": minute_values(df, "last_update"),
+        "time": "",
+        "is_benchmark": True,
+    }, len(df))
@@ -1,26 +1,431 @@
 import asyncio
+import gzip
+import hashlib
 import json
+import os
+import threading
+import time
 import websockets
-from pathlib import Path
-from dashboard_data_collector import generate_dashboard_data 
+from collections import deque
+from typing import NamedTuple
+from urllib.parse import urlparse, parse_qs
+from dashboard_data_collector import generate_dashboard_data
+from dashboard_protocol import CHANNELS, PROTOCOL_VERSION, VOLATILE_FIELDS, channel_changed, diff_snapshot, resolve_channel
 from websockets.exceptions import ConnectionClosedOK
 from datetime import datetime, timezone
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
 last_data = None
 last_epoch = -1
+last_sections = {}  # top-level section -> its encoded JSON in last_data
+last_digests = {}  # top-level section -> content hash of the last broadcast
+
+# Broadcast frames are encoded and gzipped once per cycle and shared by all
+# connections. Clients that ask for encoding=gzip get those bytes as-is, so
+# permessage-deflate is only negotiated with the others (legacy clients included)
+GZIP_LEVEL = 6
+PERMESSAGE_DEFLATE = os.getenv("WS_PERMESSAGE_DEFLATE", "1") == "1"
+
+# Per-connection send queue settings
+MAX_QUEUE_FRAMES = 8      # pending frames before a client's queue is coalesced
+SEND_TIMEOUT_SECONDS = 20  # a single send stalling longer than this drops the client
+
+# Adaptive poll interval: tighten right after a new epoch, back off while idle
+POLL_SECONDS = int(os.getenv("WS_POLL_SECONDS", 30))
+POLL_MIN_SECONDS = int(os.getenv("WS_POLL_MIN_SECONDS", 10))
+POLL_MAX_SECONDS = int(os.getenv("WS_POLL_MAX_SECONDS", 120))
+POLL_BACKOFF = float(os.getenv("WS_POLL_BACKOFF", 1.5))
+
+
+
+def encode_json(obj) -> bytes:
+    """Compact UTF-8 JSON; orjson when installed (also turns NaN into null)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def encode_sections(data: dict) -> tuple[dict, dict]:
+    """
+    Encode each top-level section of the dashboard dict once (runs in a worker thread).
+
+    Returns (encoded bytes, content hash) per section. The bytes are reused for
+    the views that carry sections unchanged; the hashes leave out VOLATILE_FIELDS.
+    """
+    encoded, digests = {}, {}
+    for key, value in data.items():
+        encoded[key] = encode_json(value)
+        volatile = VOLATILE_FIELDS.get(key)
+        if volatile and isinstance(value, dict):
+            stable = encode_json({k: v for k, v in value.items() if k not in volatile})
+        else:
+            stable = encoded[key]
+        digests[key] = hashlib.blake2b(stable, digest_size=16).digest()
+    return encoded, digests
+
+
+def next_poll_interval(interval: float, new_epoch: bool, changed: bool) -> float:
+    """Poll again soon after a new epoch, keep the pace while data moves, back off when idle"""
+    if new_epoch:
+        return POLL_MIN_SECONDS
+    if changed:
+        return max(POLL_MIN_SECONDS, min(interval, POLL_SECONDS))
+    return min(interval * POLL_BACKOFF, POLL_MAX_SECONDS)
+
+
+class Frame:
+    """
+    One encoded broadcast message, shared by every connection that sends it.
+
+    The payload is either given or built on first use by `build`; both it and
+    the gzip copy are computed once (under a lock, as worker threads and
+    writer tasks may ask at the same time). Writers call prepare() in a worker
+    thread for anything that is not ready, so the event loop never encodes.
+    """
+
+    def __init__(self, payload: bytes = None, build=None):
+        self._text = payload
+        self._build = build
+        self._gzip = None
+        self._lock = threading.Lock()
+
+    @property
+    def text(self) -> bytes:
+        if self._text is None:
+            with self._lock:
+                if self._text is None:
+                    self._text = self._build()
+        return self._text
+
+    @property
+    def gzip(self) -> bytes:
+        """Gzip-compressed payload, computed once on first use"""
+        if self._gzip is None:
+            text = self.text
+            with self._lock:
+                if self._gzip is None:
+                    self._gzip = gzip.compress(text, compresslevel=GZIP_LEVEL, mtime=0)
+        return self._gzip
+
+    def ready(self, compressed: bool) -> bool:
+        return self._text is not None and (not compressed or self._gzip is not None)
+
+    def prepare(self, compressed: bool):
+        """Encode (and compress) now; meant for worker threads"""
+        return self.gzip if compressed else self.text
+
+    @property
+    def gzip_size(self):
+        """Compressed size if it was needed this cycle, else None"""
+        return len(self._gzip) if self._gzip is not None else None
+
+
+class ChannelState(NamedTuple):
+    """One published version of a channel; replaced as a whole, never modified"""
+    version: int
+    view: dict
+    view_frame: Frame
+    snapshot: Frame
+
+
+class Channel:
+    """
+    Versioned view of one part of the dashboard dict (see CHANNELS in dashboard_protocol.py).
+
+    Patches are only diffed and encoded while somebody is subscribed; otherwise
+    the channel just keeps its latest view. The view and snapshot frames are
+    encoded lazily, once per version, and shared by every subscriber.
+
+    publish() runs in a worker thread while connect / resync read snapshots on
+    the event loop, so each version is swapped in as one ChannelState: a
+    reader always sees a version number together with its own view.
+    """
+
+    def __init__(self, name: str, select):
+        self.name = name
+        self.select = select
+        self.state = None  # ChannelState of the latest version, None until published
+        self.patch = None  # patch frame of the last publish, None if unchanged
+
+    @property
+    def view(self):
+        return self.state.view if self.state else None
+
+    @property
+    def version(self) -> int:
+        return self.state.version if self.state else 0
+
+    def publish(self, data: dict, subscribed: bool, sections: dict = None):
+        view = self.select(data)
+        version = self.version
+        self.patch = None
+        if subscribed:
+            patch = diff_snapshot(self.view, view)
+            if patch is None:
+                return
+            self.patch = Frame(encode_json({
+                "type": "patch",
+                "channel": self.name,
+                "version": version + 1,
+                "base": version,
+                "data": patch,
+            }))
+        # Views made of whole top-level sections ("*", "miners", ...) reuse their encoded bytes
+        if not (sections and all(key in sections and data.get(key) is value for key, value in view.items())):
+            sections = None
+        self.state = self._state(version + 1, view, sections)
+
+    def _state(self, version: int, view: dict, sections: dict) -> ChannelState:
+        """New state whose frames are encoded on first use"""
+        if sections:
+            view_frame = Frame(build=lambda: b"{" + b",".join(encode_json(key) + b":" + sections[key] for key in view) + b"}")
+        else:
+            view_frame = Frame(build=lambda: encode_json(view))
+        # The snapshot wraps the already-encoded view instead of serializing it again
+        header = b'{"type":"snapshot","channel":%s,"version":%d,"data":' % (encode_json(self.name), version)
+        snapshot = Frame(build=lambda: header + view_frame.text + b"}")
+        return ChannelState(version, view, view_frame, snapshot)
+
+    @property
+    def view_frame(self):
+        """The bare encoded view (for "*" this is the legacy full payload)"""
+        return self.state.view_frame if self.state else None
+
+    @property
+    def snapshot(self):
+        """Snapshot message of the latest version"""
+        return self.state.snapshot if self.state else None
+
+
+channels = {name: Channel(name, select) for name, select in CHANNELS.items()}
+
+# Serializes publishing (selection + diff, done in worker threads) between the
+# broadcast loop and first-time publishes of new parameterized channels
+publish_lock = asyncio.Lock()
+
+
+def get_channel(name: str):
+    """Existing channel, or a new (not yet published) parameterized one, e.g. "miners:500"; None if invalid"""
+    channel = channels.get(name)
+    if channel is None:
+        select = resolve_channel(name)
+        if select is not None:
+            channel = channels[name] = Channel(name, select)
+    return channel
+
+
+async def ensure_published(channel: Channel):
+    """Build a new channel's first view from the last broadcast, off the event loop"""
+    if channel.view is not None or last_data is None:
+        return
+    async with publish_lock:
+        if channel.view is None:
+            await asyncio.to_thread(channel.publish, last_data, False, last_sections)
 
-connected = set()
+
+def publish_channels(data: dict, sections: dict, changed_sections: set, subscribed: set):
+    """Select, diff and encode the patch of every changed channel (runs in a worker thread)"""
+    for channel in list(channels.values()):
+        if channel_changed(channel.name, changed_sections):
+            channel.publish(data, channel.name in subscribed, sections)
+        else:
+            channel.patch = None
+
+# Per-cycle encode time and frame sizes of the last broadcast
+encode_stats = {}
+
+# websocket -> ClientConnection
+clients = {}
+slow_client_disconnects = 0
+
+
+class ClientConnection:
+    """
+    One viewer: a bounded queue of outgoing frames drained by its own writer task,
+    so a slow or stalled viewer only ever delays itself.
+
+    Queued frames are tagged with their channel. A self-contained frame (full
+    payload, snapshot) supersedes whatever is still pending for its channel.
+    Patches are queued in order; if the queue is full the channel's pending
+    patches are coalesced into its current snapshot instead, which the client
+    can apply without a resync.
+    """
+
+    def __init__(self, websocket, params: dict):
+        self.websocket = websocket
+        try:
+            self.protocol = int(params.get("protocol", 1))
+        except ValueError:
+            self.protocol = 1
+        # Clients that can inflate gzip get the shared pre-compressed binary frame
+        self.gzip = params.get("encoding") == "gzip"
+        # Without `channels` in the URL a patch client follows the whole dict
+        if "channels" in params:
+            self.channels = {name for name in params["channels"].split(",") if get_channel(name)}
+        else:
+            self.channels = {"*"}
+        self.pending = deque()
+        self.ready = asyncio.Event()
+        self.sent_frames = 0
+        self.dropped_frames = 0
+        self.max_depth = 0
+        self.writer = asyncio.create_task(self._drain())
+
+    @property
+    def speaks_patches(self) -> bool:
+        return self.protocol >= PROTOCOL_VERSION
+
+    def _push(self, channel, message: Frame):
+        self.pending.append((channel, message))
+        self.max_depth = max(self.max_depth, len(self.pending))
+        self.ready.set()
+
+    def enqueue_full(self, channel, message):
+        """Queue a self-contained frame, dropping whatever it supersedes on the same channel"""
+        if message is None:
+            return
+        kept = deque(item for item in self.pending if item[0] != channel)
+        self.dropped_frames += len(self.pending) - len(kept)
+        self.pending = kept
+        self._push(channel, message)
+
+    def enqueue_patch(self, channel: Channel):
+        """Queue the channel's patch, or coalesce into its snapshot when the queue is full"""
+        if len(self.pending) >= MAX_QUEUE_FRAMES:
+            self.enqueue_full(channel.name, channel.snapshot)
+            self.dropped_frames += 1  # the patch itself
+        else:
+            self._push(channel.name, channel.patch)
+
+    async def subscribe(self, names):
+        for name in names:
+            channel = get_channel(name)
+            if name not in self.channels and channel:
+                self.channels.add(name)
+                await ensure_published(channel)
+                self.enqueue_full(name, channel.snapshot)
+
+    def unsubscribe(self, names):
+        self.channels.difference_update(names)
+        self.pending = deque(item for item in self.pending if item[0] is None or item[0] in self.channels)
+
+    def reject(self, error: str):
+        """
+        Tell a patch client its request was not understood (channel-less, so
+        clients ignore it). Dropped when the queue is full or an error is still
+        pending, so a client spamming bad messages can't grow its queue.
+        """
+        if len(self.pending) >= MAX_QUEUE_FRAMES or any(item[0] is None for item in self.pending):
+            self.dropped_frames += 1
+            return
+        self._push(None, Frame(encode_json({"type": "error", "error": error})))
+
+    async def _drain(self):
+        global slow_client_disconnects
+        try:
+            while True:
+                await self.ready.wait()
+                self.ready.clear()
+                while self.pending:
+                    _, frame = self.pending.popleft()
+                    if not frame.ready(self.gzip):
+                        # Snapshots are built on demand (connect, resync, coalescing)
+                        await asyncio.to_thread(frame.prepare, self.gzip)
+                    if self.gzip:
+                        send = self.websocket.send(frame.gzip)
+                    else:
+                        send = self.websocket.send(frame.text, text=True)
+                    try:
+                        await asyncio.wait_for(send, SEND_TIMEOUT_SECONDS)
+                    except asyncio.TimeoutError:
+                        slow_client_disconnects += 1
+                        print(f"Client {self.websocket.remote_address} stalled for {SEND_TIMEOUT_SECONDS}s, disconnecting")
+                        await self.websocket.close(code=1013, reason="client too slow")
+                        return
+                    self.sent_frames += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Connection closed underneath us; the handler cleans up
+            return
+
+    def close(self):
+        self.writer.cancel()
+
+
+def subscribed_channels() -> set:
+    """Channels at least one patch client is subscribed to"""
+    return {name for c in clients.values() if c.speaks_patches for name in c.channels}
+
+
+def broadcast_stats() -> dict:
+    """Queue depth / dropped frame metrics across all connected viewers"""
+    depths = [len(c.pending) for c in clients.values()]
+    subscribers = {}
+    for c in clients.values():
+        if c.speaks_patches:
+            for name in c.channels:
+                subscribers[name] = subscribers.get(name, 0) + 1
+    return {
+        "clients": len(clients),
+        "patch_clients": sum(c.speaks_patches for c in clients.values()),
+        "gzip_clients": sum(c.gzip for c in clients.values()),
+        "subscribers": subscribers,
+        "queued_frames": sum(depths),
+        "max_queue_depth": max(depths, default=0),
+        "dropped_frames": sum(c.dropped_frames for c in clients.values()),
+        "slow_client_disconnects": slow_client_disconnects,
+    }
+
+
+def query_params(path: str) -> dict:
+    """Options from the connect URL, e.g. ?protocol=2&encoding=gzip&channels=miners; legacy clients send none"""
+    try:
+        query = parse_qs(urlparse(path).query, keep_blank_values=True)
+        return {key: values[0] for key, values in query.items()}
+    except Exception:
+        return {}
+
+
+def client_params(websocket) -> dict:
+    return query_params(websocket.request.path)
+
+
+def negotiate_compression(connection, request):
+    """
+    Handshake hook: clients receiving pre-gzipped frames don't get
+    permessage-deflate on top; everybody else negotiates it as usual.
+    """
+    if query_params(request.path).get("encoding") == "gzip":
+        connection.protocol.available_extensions = []
+    return None
+
+
+def prepare_frames(need_full: bool, gzip_full: bool, gzip_patches: bool):
+    """Do the cycle's heavy encoding / compression up front (runs in a worker thread)"""
+    if need_full:
+        channels["*"].view_frame.prepare(gzip_full)
+    if gzip_patches:
+        for channel in list(channels.values()):
+            if channel.patch is not None:
+                channel.patch.gzip
 
 
 async def notify_clients():
-    global last_data, last_epoch
+    global last_data, last_epoch, last_sections, last_digests
     loop_counter = 0  # Initialize loop counter
+    interval = POLL_SECONDS
 
     while True:
         loop_counter += 1
         now_utc = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
         print(f"[{now_utc}] Loop {loop_counter}: generate_dashboard_data")
 
+        new_epoch = changed = False
         try:
             data = await asyncio.to_thread(
                 generate_dashboard_data,
@@ -37,55 +442,139 @@ async def notify_clients():
                 new_max_epoch = last_epoch
 
             # Always update last_data, but only update last_epoch if we found a new one
-            data_json = json.dumps(data)
-            
+
             # Debug: print data summary
-            print(f"Data summary:")
+            print("Data summary:")
             print(f"  - run_id: {data.get('run_id')}")
             print(f"  - global_loss_data keys: {list(data.get('global_loss_data', {}).keys())}")
             print(f"  - outer_steps count: {len(data.get('global_loss_data', {}).get('outer_steps', []))}")
             print(f"  - losses count: {len(data.get('global_loss_data', {}).get('losses', []))}")
             print(f"  - validators count: {len(data.get('validators', {}))}")
             print(f"  - miners count: {len(data.get('miners', {}))}")
-            
+
+            # Encode and hash each section once; only push the ones whose content changed
+            sections, digests = await asyncio.to_thread(encode_sections, data)
+            changed_sections = {key for key in digests.keys() | last_digests.keys() if digests.get(key) != last_digests.get(key)}
+            changed = bool(changed_sections)
+
             if new_max_epoch > last_epoch:
                 print(f"📈 New epoch {new_max_epoch} detected \n")
+                new_epoch = last_data is not None
                 last_epoch = new_max_epoch
             elif last_data is None:
                 print(f"📊 Initial data loaded (epoch: {new_max_epoch if new_max_epoch != -1 else 'N/A'}) \n")
+            elif changed:
+                print(f"⏳ No new epoch (latest: {last_epoch}) — changed: {sorted(changed_sections)} \n")
             else:
-                print(f"⏳ No new epoch (latest: {last_epoch}) — updating data \n")
-            
-            last_data = data_json
+                print(f"💤 No changes (latest epoch: {last_epoch}) — nothing to broadcast \n")
+            last_data = data
+            last_sections = sections
+            last_digests = digests
+
+            if not changed:
+                continue
 
-            for ws in connected.copy():
-                try:
-                    await ws.send(last_data)
-                except Exception:
-                    connected.discard(ws)
+            # Diff and encode each changed channel once, and only the ones somebody watches
+            encode_started = time.perf_counter()
+            # Parameterized channels only live while somebody watches them
+            subscribed = subscribed_channels()
+            for name in [name for name in channels if name not in CHANNELS and name not in subscribed]:
+                del channels[name]
+            async with publish_lock:
+                await asyncio.to_thread(publish_channels, data, sections, changed_sections, subscribed)
+            legacy = any(not c.speaks_patches for c in clients.values())
+            await asyncio.to_thread(
+                prepare_frames,
+                legacy,
+                any(c.gzip and not c.speaks_patches for c in clients.values()),
+                any(c.gzip and c.speaks_patches for c in clients.values()),
+            )
+            full_frame = channels["*"].view_frame if legacy else None
+
+            encode_stats.clear()
+            encode_stats.update({
+                "encoder": "orjson" if orjson else "json",
+                "encode_ms": round((time.perf_counter() - encode_started) * 1000, 1),
+                "full_bytes": len(full_frame.text) if full_frame else None,
+                "full_gzip_bytes": full_frame.gzip_size if full_frame else None,
+                "patch_bytes": {
+                    c.name: (len(c.patch.text), c.patch.gzip_size)
+                    for c in channels.values() if c.patch is not None
+                },
+            })
+            print(f"Encode: {encode_stats}")
+
+            # Fan out without awaiting: each client's writer task sends at its own pace
+            for client in list(clients.values()):
+                if not client.speaks_patches:
+                    client.enqueue_full(None, full_frame)
+                    continue
+                for name in client.channels:
+                    channel = channels.get(name)
+                    if channel is not None and channel.patch is not None:
+                        client.enqueue_patch(channel)
+            print(f"Broadcast: {broadcast_stats()}")
 
         except Exception as e:
             print("Error in notify_clients:", e)
 
-        await asyncio.sleep(30)
+        finally:
+            interval = next_poll_interval(interval, new_epoch, changed)
+            print(f"Next poll in {interval:.0f}s")
+            await asyncio.sleep(interval)
 
 
 async def handler(websocket):
+    client = ClientConnection(websocket, client_params(websocket))
     try:
         print(f"Client connected: {websocket.remote_address}")
-        connected.add(websocket)
+        clients[websocket] = client
 
-        if last_data:
-            await websocket.send(last_data)
+        if client.speaks_patches:
+            for name in list(client.channels):
+                await ensure_published(channels[name])
+                client.enqueue_full(name, channels[name].snapshot)
+        else:
+            client.enqueue_full(None, channels["*"].view_frame)
 
-        await websocket.wait_closed()
+        async for message in websocket:
+            if not client.speaks_patches:
+                continue
+            try:
+                request = json.loads(message)
+            except (TypeError, ValueError):
+                client.reject("invalid JSON")
+                continue
+            if not isinstance(request, dict):
+                client.reject("expected a JSON object")
+                continue
+
+            kind = request.get("type")
+            if kind in ("subscribe", "unsubscribe"):
+                names = request.get("channels", [])
+                if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+                    client.reject("channels must be a list of channel names")
+                elif kind == "subscribe":
+                    await client.subscribe(names)
+                else:
+                    client.unsubscribe(names)
+            elif kind == "resync":
+                # Client missed a version: send the channel's current snapshot
+                name = request.get("channel", "*")
+                if not isinstance(name, str):
+                    client.reject("channel must be a channel name")
+                elif name in client.channels:
+                    client.enqueue_full(name, channels[name].snapshot)
+            else:
+                client.reject(f"unknown message type: {kind!r}")
 
     except ConnectionClosedOK:
         pass
     except Exception as e:
         print(f"WebSocket client error: {e}")
     finally:
-        connected.discard(websocket)
+        clients.pop(websocket, None)
+        client.close()
         print(f"Client disconnected: {websocket.remote_address}")
 
 
@@ -93,7 +582,7 @@ async def main():
     server_ip = "0.0.0.0"
     port = 8765
     print(f"Starting WebSocket server on ws://{server_ip}:{port}")
-    print(f"To make this websockets server available on HTTPS, as Vercel requires, apply ngrok tunneling (README.md)\n")
+    print("To make this websockets server available on HTTPS, as Vercel requires, apply ngrok tunneling (README.md)\n")
 
     async with websockets.serve(
         handler,
@@ -101,6 +590,8 @@ async def main():
         port,
         ping_interval=20,
         ping_timeout=20,
+        compression="deflate" if PERMESSAGE_DEFLATE else None,
+        process_request=negotiate_compression if PERMESSAGE_DEFLATE else None,
     ):
         await notify_clients()
 
@@ -10,7 +10,7 @@ import {
   Tooltip,
   Legend,
 } from 'chart.js';
-import websocketConfig from '../config/websocketUrls'; 
+import { subscribeDashboard } from '../services/dashboardSocket';
 
 ChartJS.register(
   CategoryScale,
@@ -22,25 +22,23 @@ ChartJS.register(
   Legend
 );
 
+// Each miner's loss history is downsampled server-side to at most this many points
+const MINER_POINTS = 1000;
+
 export default function MinerGraphV1() {
   const [chartData, setChartData] = useState(null);
   const [runId, setRunId] = useState(null);
-  const wsRef = useRef(null);
   const chartRef = useRef(null);
 
   useEffect(() => {
-    const ws = new WebSocket(websocketConfig.WS_URL);
-
-    wsRef.current = ws;
-
-    ws.onmessage = (event) => {
+    const unsubscribe = subscribeDashboard((data) => {
       try {
-        const data = JSON.parse(event.data);
         setRunId(data.run_id);
 
         const minerDatasets = Object.entries(data.miners).map(([uid, miner], idx) => ({
           label: `Miner ${uid}`,
-          data: miner.loss,
+          // {x: epoch} keeps downsampled series aligned with the epoch labels
+          data: miner.epoch.map((epoch, i) => ({ x: epoch, y: miner.loss[i] })),
           borderColor: `hsl(${(idx * 36) % 360}, 70%, 60%)`,
           backgroundColor: 'transparent',
           yAxisID: 'y1',
@@ -79,17 +77,11 @@ export default function MinerGraphV1() {
           }
         }, 300);
       } catch (err) {
-        console.error('Error parsing WebSocket message:', err);
+        console.error('Error handling dashboard update:', err);
       }
-    };
+    }, [`miners:${MINER_POINTS}`, 'validators.peers']);
 
-    ws.onerror = (err) => {
-      console.error('WebSocket error:', err);
-    };
-
-    return () => {
-      ws.close();
-    };
+    return unsubscribe;
   }, []);
 
   useEffect(() => {
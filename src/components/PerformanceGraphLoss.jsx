@@ -10,7 +10,7 @@ import {
   Tooltip,
   Legend,
 } from "chart.js";
-import websocketConfig from "../config/websocketUrls";
+import { subscribeDashboard } from "../services/dashboardSocket";
 
 ChartJS.register(
   CategoryScale,
@@ -24,17 +24,12 @@ ChartJS.register(
 
 export default function InvestorGraphLoss() {
   const chartRef = useRef(null);
-  const wsRef = useRef(null);
   const [chartData, setChartData] = useState(null);
   const [runId, setRunId] = useState(null);
 
   useEffect(() => {
-    const ws = new WebSocket(websocketConfig.WS_URL);
-    wsRef.current = ws;
-
-    ws.onmessage = (event) => {
+    const unsubscribe = subscribeDashboard((data) => {
       try {
-        const data = JSON.parse(event.data);
         setRunId(data.run_id || null);
 
         const lossGraph = data.global_loss_data || {};
@@ -67,17 +62,11 @@ export default function InvestorGraphLoss() {
           }
         }, 300);
       } catch (err) {
-        console.error("Error parsing WebSocket message in InvestorGraphLoss:", err);
+        console.error("Error handling dashboard update in InvestorGraphLoss:", err);
       }
-    };
-
-    ws.onerror = (err) => {
-      console.error("WebSocket error in InvestorGraphLoss:", err);
-    };
+    }, ['global_loss']);
 
-    return () => {
-      ws.close();
-    };
+    return unsubscribe;
   }, []);
 
   const options = {
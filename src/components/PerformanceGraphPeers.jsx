@@ -10,7 +10,7 @@ import {
   Tooltip,
   Legend,
 } from 'chart.js';
-import websocketConfig from '../config/websocketUrls';
+import { subscribeDashboard } from '../services/dashboardSocket';
 
 ChartJS.register(
   CategoryScale,
@@ -24,17 +24,12 @@ ChartJS.register(
 
 export default function InvestorGraphPeers() {
   const chartRef = useRef(null);
-  const wsRef = useRef(null);
   const [chartData, setChartData] = useState(null);
   const [runId, setRunId] = useState(null);
 
   useEffect(() => {
-    const ws = new WebSocket(websocketConfig.WS_URL);
-    wsRef.current = ws;
-
-    ws.onmessage = (event) => {
+    const unsubscribe = subscribeDashboard((data) => {
       try {
-        const data = JSON.parse(event.data);
         setRunId(data.run_id || null);
 
         const validatorUIDs = Object.keys(data.validators || {});
@@ -83,15 +78,9 @@ export default function InvestorGraphPeers() {
       } catch {
         // silently ignore parse errors
       }
-    };
+    }, ['validators.peers']);
 
-    ws.onerror = () => {
-      // silently ignore errors here
-    };
-
-    return () => {
-      ws.close();
-    };
+    return unsubscribe;
   }, []);
 
   useEffect(() => {
@@ -11,7 +11,7 @@ import {
   Tooltip,
   Legend,
 } from "chart.js";
-import websocketConfig from "../config/websocketUrls";
+import { subscribeDashboard } from "../services/dashboardSocket";
 
 ChartJS.register(
   CategoryScale,
@@ -26,17 +26,12 @@ ChartJS.register(
 
 export default function InvestorGraphPerplexity() {
   const chartRef = useRef(null);
-  const wsRef = useRef(null);
   const [chartData, setChartData] = useState(null);
   const [runId, setRunId] = useState(null);
 
   useEffect(() => {
-    const ws = new WebSocket(websocketConfig.WS_URL);
-    wsRef.current = ws;
-
-    ws.onmessage = (event) => {
+    const unsubscribe = subscribeDashboard((data) => {
       try {
-        const data = JSON.parse(event.data);
         setRunId(data.run_id || null);
 
         const lossGraph = data.global_loss_data || {};
@@ -73,19 +68,13 @@ export default function InvestorGraphPerplexity() {
         }, 300);
       } catch (err) {
         console.error(
-          "Error parsing WebSocket message in InvestorGraphPerplexity:",
+          "Error handling dashboard update in InvestorGraphPerplexity:",
           err
         );
       }
-    };
-
-    ws.onerror = (err) => {
-      console.error("WebSocket error in InvestorGraphPerplexity:", err);
-    };
+    }, ['global_loss']);
 
-    return () => {
-      ws.close();
-    };
+    return unsubscribe;
   }, []);
 
   const options = {
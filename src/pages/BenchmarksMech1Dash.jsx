@@ -131,14 +131,45 @@ const BenchmarksMech1Dashboard = () => {
     }
   }, []);
 
+  // New blocks are pushed over SSE; poll only while the stream is unavailable
   useEffect(() => {
-    fetchData(selectedBlock);
-    fetchHistory();
-    const interval = setInterval(() => {
+    const refresh = () => {
       fetchData(selectedBlock);
       fetchHistory();
-    }, 15000);
-    return () => clearInterval(interval);
+    };
+    refresh();
+
+    let interval = null;
+    const startPolling = () => {
+      if (!interval) interval = setInterval(refresh, 15000);
+    };
+    const stopPolling = () => {
+      clearInterval(interval);
+      interval = null;
+    };
+
+    if (typeof EventSource === 'undefined') {
+      startPolling();
+      return stopPolling;
+    }
+
+    const source = new EventSource(`${API_BASE_URL}/api/mech1/stream`);
+    let lastBlocks = null;
+    source.addEventListener('block', (event) => {
+      const { current_block, benchmark_block } = JSON.parse(event.data);
+      const blocks = `${current_block}:${benchmark_block}`;
+      // The first event only reports the state we just fetched (or missed while reconnecting)
+      if (lastBlocks !== null && blocks !== lastBlocks) refresh();
+      lastBlocks = blocks;
+      stopPolling();
+    });
+    // EventSource keeps reconnecting on its own; poll meanwhile
+    source.onerror = startPolling;
+
+    return () => {
+      source.close();
+      stopPolling();
+    };
   }, [fetchData, fetchHistory, selectedBlock]);
   
   // Real-time countdown timer - ticks every second
@@ -3,33 +3,24 @@ import InvestorGraphLoss from '../components/PerformanceGraphLoss';
 import InvestorGraphPerplexity from '../components/PerformanceGraphPerplexity';
 import InvestorGraphPeers from '../components/PerformanceGraphPeers';
 import InvestorGraphLR from '../components/PerformanceGraphLR';
-import websocketConfig from '../config/websocketUrls';
+import { subscribeDashboard } from '../services/dashboardSocket';
 import '../styles/PerformanceDashboard.css';
 
 const PerformanceDashboard = () => {
   const [runId, setRunId] = useState('7');
   const [modelSize, setModelSize] = useState('4.0B');
   const [activeMiners, setActiveMiners] = useState('200');
+  const [metagraph, setMetagraph] = useState(null);
   const [modelName, setModelName] = useState("distributed/llama-4b");
 
   useEffect(() => {
-    const ws = new WebSocket(websocketConfig.WS_URL);
+    const unsubscribe = subscribeDashboard((data) => {
+      if (data.run_id) setRunId(data.run_id);
+      if (data.active_miners) setActiveMiners(data.active_miners);
+      if (data.metagraph) setMetagraph(data.metagraph);
+    }, ['active_miners']);
 
-    ws.onmessage = (event) => {
-      try {
-        const data = JSON.parse(event.data);
-        if (data.run_id) setRunId(data.run_id);
-        if (data.active_miners) setActiveMiners(data.active_miners);
-      } catch (err) {
-        console.error('Error parsing WS message:', err);
-      }
-    };
-
-    ws.onerror = (err) => {
-      console.error('WebSocket error:', err);
-    };
-
-    return () => ws.close();
+    return unsubscribe;
   }, []);
 
   useEffect(() => {
@@ -63,7 +54,12 @@ const PerformanceDashboard = () => {
               </div>
               <div className="info-card">
                 <div className="info-label">Active Miners</div>
-                <div className="info-value">{activeMiners}</div>
+                <div
+                  className="info-value"
+                  title={metagraph?.synced_at ? `Metagraph block ${metagraph.block}, synced ${metagraph.synced_at}` : undefined}
+                >
+                  {activeMiners}{metagraph?.stale ? ' (stale)' : ''}
+                </div>
               </div>
               <div className="info-card">
                 <div className="info-label">Model</div>
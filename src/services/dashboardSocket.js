@@ -0,0 +1,186 @@
+// src/services/dashboardSocket.js
+//
+// One shared WebSocket to data/websocket_server.py for every chart on the page.
+// Speaks the snapshot/patch protocol (data/dashboard_protocol.py): each chart
+// subscribes to the channels it draws, gets a snapshot per channel and then
+// small versioned patches that are applied to the local copy. Channels are
+// multiplexed over the one connection and ref-counted across charts.
+// Where the browser can inflate gzip, frames arrive as one pre-compressed binary
+// payload shared by all viewers instead of text.
+
+import websocketConfig from '../config/websocketUrls';
+
+const PROTOCOL_VERSION = 2;
+const SUPPORTS_GZIP = typeof DecompressionStream !== 'undefined';
+
+let socket = null;
+let closeTimer = null;
+let decoding = Promise.resolve();
+// channel -> { version, data }
+let views = {};
+// channel -> number of subscribed listeners
+const refCounts = {};
+// listener -> channels
+const listeners = new Map();
+
+// Mirror of apply_patch in data/dashboard_protocol.py
+export function applyPatch(target, patch) {
+  if ('$set' in patch) return patch.$set;
+
+  if ('$at' in patch) {
+    const at = patch.$at;
+    const series = {};
+    Object.keys(patch).forEach((key) => {
+      if (key === '$at') return;
+      series[key] = (target?.[key] || []).slice(0, at).concat(patch[key]);
+    });
+    return series;
+  }
+
+  const out = { ...(target || {}) };
+  (patch.$removed || []).forEach((key) => delete out[key]);
+  Object.keys(patch).forEach((key) => {
+    if (key !== '$removed') out[key] = applyPatch(out[key], patch[key]);
+  });
+  return out;
+}
+
+function isPlainObject(value) {
+  return value !== null && typeof value === 'object' && !Array.isArray(value);
+}
+
+// Channel views are subsets of the dashboard dict; merge them back into its shape
+function mergeInto(target, view) {
+  Object.keys(view).forEach((key) => {
+    target[key] = isPlainObject(target[key]) && isPlainObject(view[key])
+      ? mergeInto({ ...target[key] }, view[key])
+      : view[key];
+  });
+  return target;
+}
+
+function composite(channels) {
+  const loaded = channels.filter((channel) => views[channel]);
+  if (loaded.length === 0) return null;
+  return loaded.reduce((data, channel) => mergeInto(data, views[channel].data), {});
+}
+
+function send(message) {
+  if (socket && socket.readyState === WebSocket.OPEN) socket.send(JSON.stringify(message));
+}
+
+function notify(channel) {
+  listeners.forEach((channels, listener) => {
+    if (!channels.includes(channel)) return;
+    try {
+      listener(composite(channels));
+    } catch (err) {
+      console.error('Dashboard listener error:', err);
+    }
+  });
+}
+
+async function decodeFrame(payload) {
+  if (typeof payload === 'string') return payload;
+  const stream = payload.stream().pipeThrough(new DecompressionStream('gzip'));
+  return new Response(stream).text();
+}
+
+function handleMessage(text) {
+  let message;
+  try {
+    message = JSON.parse(text);
+  } catch (err) {
+    console.error('Error parsing dashboard WebSocket message:', err);
+    return;
+  }
+
+  const { channel } = message;
+  if (!refCounts[channel]) return; // unsubscribed while the frame was in flight
+
+  if (message.type === 'snapshot') {
+    views[channel] = { version: message.version, data: message.data };
+    notify(channel);
+  } else if (message.type === 'patch') {
+    const view = views[channel];
+    if (!view || message.base !== view.version) {
+      // Missed a version: ask for a fresh snapshot instead of applying out of order
+      send({ type: 'resync', channel });
+      return;
+    }
+    views[channel] = { version: message.version, data: applyPatch(view.data, message.data) };
+    notify(channel);
+  }
+}
+
+function connect() {
+  const url = new URL(websocketConfig.WS_URL);
+  url.searchParams.set('protocol', PROTOCOL_VERSION);
+  if (SUPPORTS_GZIP) url.searchParams.set('encoding', 'gzip');
+  // Subscriptions are sent once the socket is open
+  url.searchParams.set('channels', '');
+
+  const ws = new WebSocket(url.toString());
+  ws.onopen = () => {
+    const active = Object.keys(refCounts).filter((channel) => refCounts[channel] > 0);
+    if (active.length) send({ type: 'subscribe', channels: active });
+  };
+  ws.onmessage = (event) => {
+    // Decompression is async: chain it so patches are applied in arrival order
+    decoding = decoding
+      .then(() => decodeFrame(event.data))
+      .then((text) => {
+        if (socket === ws) handleMessage(text);
+      })
+      .catch((err) => console.error('Error decoding dashboard frame:', err));
+  };
+  ws.onerror = (err) => {
+    console.error('Dashboard WebSocket error:', err);
+  };
+  ws.onclose = () => {
+    if (socket !== ws) return;
+    socket = null;
+    views = {};
+  };
+  socket = ws;
+}
+
+// Calls listener(data) whenever one of `channels` updates, with those channels
+// merged into the usual dashboard dict shape (default: the whole dict).
+// Returns an unsubscribe function.
+export function subscribeDashboard(listener, channels = ['*']) {
+  listeners.set(listener, channels);
+  clearTimeout(closeTimer);
+
+  if (!socket || socket.readyState >= WebSocket.CLOSING) connect();
+
+  const added = channels.filter((channel) => {
+    refCounts[channel] = (refCounts[channel] || 0) + 1;
+    return refCounts[channel] === 1;
+  });
+  if (added.length) send({ type: 'subscribe', channels: added });
+
+  const data = composite(channels);
+  if (data) listener(data);
+
+  return () => {
+    listeners.delete(listener);
+    const removed = channels.filter((channel) => {
+      refCounts[channel] -= 1;
+      return refCounts[channel] === 0;
+    });
+    if (removed.length) {
+      removed.forEach((channel) => {
+        delete refCounts[channel];
+        delete views[channel];
+      });
+      send({ type: 'unsubscribe', channels: removed });
+    }
+    // Delay closing so a quick unmount/remount (StrictMode, route change) reuses the socket
+    if (listeners.size === 0) {
+      closeTimer = setTimeout(() => {
+        if (listeners.size === 0 && socket) socket.close();
+      }, 1000);
+    }
+  };
+}